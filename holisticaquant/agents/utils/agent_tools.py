@@ -217,8 +217,14 @@ def get_sina_news(trigger_time: Optional[str] = None) -> str:
             max_records=_get_max_records()
         )
         
-        # 运行异步方法
-        df = _run_async(source.fetch_data_async(trigger_time_str))
+        # 运行异步方法（结束后在同一事件循环中关闭爬虫复用的 HTTP 会话）
+        async def _fetch():
+            try:
+                return await source.fetch_data_async(trigger_time_str)
+            finally:
+                await source.aclose()
+        
+        df = _run_async(_fetch())
         
         return _format_dataframe_for_llm(df)
     except Exception as e:
@@ -252,7 +258,14 @@ def get_thx_news(trigger_time: Optional[str] = None) -> str:
             max_pages=thx_config["max_pages"]
         )
         
-        df = _run_async(source.fetch_data_async(trigger_time_str))
+        # 运行异步方法（结束后在同一事件循环中关闭爬虫复用的 HTTP 会话）
+        async def _fetch():
+            try:
+                return await source.fetch_data_async(trigger_time_str)
+            finally:
+                await source.aclose()
+        
+        df = _run_async(_fetch())
         
         return _format_dataframe_for_llm(df)
     except Exception as e:
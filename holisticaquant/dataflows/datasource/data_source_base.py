@@ -1,10 +1,15 @@
 import pandas as pd
 import asyncio
+import re
 from pathlib import Path
 from typing import Optional
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
 from ...config.config import PROJECT_ROOT
+from loguru import logger
+
+# akshare 未安装类错误的判断：合并为一个预编译正则，一次扫描完成
+_AKSHARE_MISSING_RE = re.compile(r'akshare|未安装|not installed', re.IGNORECASE)
 
 
 class DataSourceBase(ABC):
@@ -69,6 +74,31 @@ class DataSourceBase(ABC):
             use_cache=self.use_cache
         )
 
+    @staticmethod
+    def _log_akshare_error(e: Exception, context: str) -> str:
+        """
+        统一记录 akshare 调用失败的日志
+        
+        akshare 未安装导致的 ImportError 记为 error，其余（网络、数据为空等）记为 warning。
+        
+        Args:
+            e: 捕获的异常
+            context: 日志前缀，如"获取涨停数据失败"
+            
+        Returns:
+            错误信息文本（异常信息为空时使用异常类型）
+        """
+        error_type = type(e).__name__
+        error_msg = str(e) or f"{error_type}异常"
+        # 检查是否是真正的 ImportError（akshare未安装）；非 ImportError 时不做正则扫描
+        is_import_error = isinstance(e, ImportError) or isinstance(e.__cause__, ImportError)
+        
+        if is_import_error and _AKSHARE_MISSING_RE.search(error_msg):
+            logger.error(f"{context}: {error_msg}")
+        else:
+            logger.warning(f"{context}（{error_type}）: {error_msg}")
+        return error_msg
+
     def get_data_cached(self, trigger_time: str) -> Optional[pd.DataFrame]:
         """
         从缓存中获取数据
@@ -4,8 +4,10 @@
 整合涨跌停、龙虎榜、游资等资金流市场数据
 注意：此版本不包含 LLM 总结，只返回格式化的数据文本
 """
+import numpy as np
 import pandas as pd
 import asyncio
+from collections import Counter
 from datetime import datetime, timedelta
 from typing import Optional
 from loguru import logger
@@ -15,6 +17,47 @@ from ..utils.akshare_utils import akshare_cached
 from ..utils.date_utils import get_previous_trading_date
 
 
+# 资金流摘要的固定模板（模块加载时创建一次，渲染时只做 format）
+_SUMMARY_HEADER_TMPL = "## {trade_date} 资金流数据摘要\n"
+_ZT_LINE_TMPL = "- {name}({code}): {change_rate:.2f}%, 连板{lianban}天, 炸板{zaban}次"
+_DT_LINE_TMPL = "- {name}({code}): {change_rate:.2f}%, 连续跌停{lianxu_dt}天"
+_LHB_LINE_TMPL = "- {name}({code}): {change_rate:.2f}%, 净买额{net_buy}"
+_JG_LINE_TMPL = "- {name}: 机构净买额{net_buy_wan:.0f}万元"
+_CONCEPT_LINE_TMPL = "- {name}: {change_rate:.2f}%, 上涨率{up_ratio:.0f}%({up_count}/{total_count})"
+_YYB_LINE_TMPL = "- {name}: 今日操作{ops}次, 最高金额{amount}"
+
+_INT32_MIN = -2**31
+_INT32_MAX = 2**31 - 1
+
+
+def _compact(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    压缩 DataFrame 的数据类型以减少内存占用
+    
+    - int64 -> int32（数值范围允许时）
+    - 低基数的字符串列 -> category
+    
+    浮点列保持 float64：降为 float32 会改变数值（如 12.34 -> 12.34000015），金额求和时误差还会累积。
+    
+    Args:
+        df: 原始 DataFrame
+        
+    Returns:
+        类型压缩后的 DataFrame
+    """
+    converted = {}
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_integer_dtype(series):
+            # 只降到 int32，避免 int8/int16 在后续加法中溢出
+            if series.empty or (series.min() >= _INT32_MIN and series.max() <= _INT32_MAX):
+                converted[col] = series.astype('int32')
+        elif pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            if len(series) > 1 and series.nunique(dropna=False) <= len(series) // 2:
+                converted[col] = series.astype('category')
+    return df.assign(**converted) if converted else df
+
+
 class HotMoneyAkshare(DataSourceBase):
     """
     资金流数据源（基于 akshare）
@@ -22,6 +65,18 @@ class HotMoneyAkshare(DataSourceBase):
     获取涨跌停、龙虎榜、概念板块、游资营业部等数据
     """
     
+    # 各类数据下游实际使用的列（获取后立即投影，减少内存占用）
+    _ZT_COLS = ['名称', '代码', '涨跌幅', '连板数', '炸板次数', '最新价', '封单金额']
+    _DT_COLS = ['名称', '代码', '涨跌幅', '连续跌停', '最新价']
+    _LHB_COLS = ['名称', '代码', '上榜日', '涨跌幅', '龙虎榜净买额', '买入额', '卖出额']
+    _LHB_JG_COLS = ['名称', '代码', '机构买入净额']
+    _CONCEPT_COLS = ['板块名称', '涨跌幅', '上涨家数', '下跌家数', '总市值']
+    _YYB_COLS = ['营业部名称', '今日最高操作', '今日最高金额']
+    
+    # 失败路径复用的空 DataFrame（只读，避免每次失败都重新分配）
+    _EMPTY_DF = pd.DataFrame()
+    _EMPTY_RESULT_DF = pd.DataFrame(columns=DataSourceBase.REQUIRED_COLUMNS)
+    
     def __init__(self, 
                  max_size_kb: Optional[float] = 512.0,
                  max_time_range_days: Optional[int] = 7,
@@ -38,6 +93,57 @@ class HotMoneyAkshare(DataSourceBase):
                         max_time_range_days=max_time_range_days,
                         max_records=max_records, use_cache=use_cache)
 
+    def _run_akshare_by_date(self, func_name: str, func_kwargs: dict, trade_date: str) -> pd.DataFrame:
+        """
+        按交易日缓存 akshare 结果（parquet 格式）
+        
+        历史交易日的数据不会再变化，因此当 trade_date 早于今天且启用缓存时，
+        结果会持久化到 data_cache/hot_money_akshare/{func_name}/{trade_date}.parquet，
+        之后直接从磁盘读取，不再访问网络。
+        
+        Args:
+            func_name: akshare 函数名
+            func_kwargs: 函数参数字典
+            trade_date: 交易日期，格式：YYYYMMDD
+            
+        Returns:
+            akshare 函数返回的 DataFrame
+        """
+        cacheable = self.use_cache and trade_date < datetime.now().strftime('%Y%m%d')
+        cache_file = self.data_cache_dir / func_name / f"{trade_date}.parquet"
+        
+        if cacheable and cache_file.exists():
+            try:
+                return pd.read_parquet(cache_file)
+            except Exception as e:
+                logger.debug(f"读取 parquet 缓存失败 {cache_file}: {e}")
+        
+        df = self._run_akshare(func_name=func_name, func_kwargs=func_kwargs, verbose=False)
+        
+        if cacheable and isinstance(df, pd.DataFrame) and not df.empty:
+            try:
+                cache_file.parent.mkdir(parents=True, exist_ok=True)
+                df.to_parquet(cache_file, compression="zstd")
+            except Exception as e:
+                # 未安装 pyarrow 或列类型无法序列化时，跳过磁盘缓存
+                logger.debug(f"写入 parquet 缓存失败 {cache_file}: {e}")
+        
+        return df
+
+    @staticmethod
+    def _select_columns(df: pd.DataFrame, columns: list) -> pd.DataFrame:
+        """
+        只保留下游需要的列（缺失的列直接跳过）
+        
+        Args:
+            df: 原始 DataFrame
+            columns: 需要保留的列名列表
+            
+        Returns:
+            投影后的 DataFrame
+        """
+        return df[[c for c in columns if c in df.columns]]
+
     def get_zt_data(self, trade_date: str) -> pd.DataFrame:
         """
         获取涨停股票数据
@@ -49,34 +155,25 @@ class HotMoneyAkshare(DataSourceBase):
             涨停股票 DataFrame
         """
         try:
-            df = self._run_akshare(
+            df = self._run_akshare_by_date(
                 func_name="stock_zt_pool_em",
                 func_kwargs={"date": trade_date},
-                verbose=False
+                trade_date=trade_date
             )
             
             if df.empty:
                 logger.warning(f"{trade_date} 无涨停数据")
-                return pd.DataFrame()
+                return self._EMPTY_DF
+            
+            df = self._select_columns(df, self._ZT_COLS)
+            df = _compact(df)
             
             logger.info(f"获取 {trade_date} 涨停数据成功，{len(df)} 条记录")
             return df
             
         except Exception as e:
-            error_type = type(e).__name__
-            error_msg = str(e) if str(e) else f"{error_type}异常"
-            # 检查是否是真正的 ImportError（akshare未安装）
-            is_import_error = isinstance(e, ImportError) or (
-                hasattr(e, '__cause__') and e.__cause__ and isinstance(e.__cause__, ImportError)
-            )
-            # 检查错误信息是否包含"未安装"
-            has_install_msg = "未安装" in error_msg or "not installed" in error_msg.lower()
-            
-            if is_import_error and ("akshare" in error_msg.lower() or has_install_msg):
-                logger.error(f"获取涨停数据失败: {error_msg}")
-            else:
-                logger.warning(f"获取涨停数据失败（{error_type}）: {error_msg}")
-            return pd.DataFrame()
+            self._log_akshare_error(e, "获取涨停数据失败")
+            return self._EMPTY_DF
 
     def get_dt_data(self, trade_date: str) -> pd.DataFrame:
         """
@@ -89,34 +186,25 @@ class HotMoneyAkshare(DataSourceBase):
             跌停股票 DataFrame
         """
         try:
-            df = self._run_akshare(
+            df = self._run_akshare_by_date(
                 func_name="stock_zt_pool_dtgc_em",
                 func_kwargs={"date": trade_date},
-                verbose=False
+                trade_date=trade_date
             )
             
             if df.empty:
                 logger.warning(f"{trade_date} 无跌停数据")
-                return pd.DataFrame()
+                return self._EMPTY_DF
+            
+            df = self._select_columns(df, self._DT_COLS)
+            df = _compact(df)
             
             logger.info(f"获取 {trade_date} 跌停数据成功，{len(df)} 条记录")
             return df
             
         except Exception as e:
-            error_type = type(e).__name__
-            error_msg = str(e) if str(e) else f"{error_type}异常"
-            # 检查是否是真正的 ImportError（akshare未安装）
-            is_import_error = isinstance(e, ImportError) or (
-                hasattr(e, '__cause__') and e.__cause__ and isinstance(e.__cause__, ImportError)
-            )
-            # 检查错误信息是否包含"未安装"
-            has_install_msg = "未安装" in error_msg or "not installed" in error_msg.lower()
-            
-            if is_import_error and ("akshare" in error_msg.lower() or has_install_msg):
-                logger.error(f"获取跌停数据失败: {error_msg}")
-            else:
-                logger.warning(f"获取跌停数据失败（{error_type}）: {error_msg}")
-            return pd.DataFrame()
+            self._log_akshare_error(e, "获取跌停数据失败")
+            return self._EMPTY_DF
 
     def get_lhb_data(self, trade_date: str) -> pd.DataFrame:
         """
@@ -134,34 +222,25 @@ class HotMoneyAkshare(DataSourceBase):
             start_date_obj = datetime.strptime(trade_date, '%Y%m%d') - timedelta(days=10)
             start_date = start_date_obj.strftime('%Y%m%d')
             
-            df = self._run_akshare(
+            df = self._run_akshare_by_date(
                 func_name="stock_lhb_detail_em",
                 func_kwargs={"start_date": start_date, "end_date": end_date},
-                verbose=False
+                trade_date=trade_date
             )
             
             if df.empty:
                 logger.warning(f"{start_date}到{end_date} 无龙虎榜数据")
-                return pd.DataFrame()
+                return self._EMPTY_DF
+            
+            df = self._select_columns(df, self._LHB_COLS)
+            df = _compact(df)
             
             logger.info(f"获取 {start_date}到{end_date} 龙虎榜数据成功，{len(df)} 条记录")
             return df
             
         except Exception as e:
-            error_type = type(e).__name__
-            error_msg = str(e) if str(e) else f"{error_type}异常"
-            # 检查是否是真正的 ImportError（akshare未安装）
-            is_import_error = isinstance(e, ImportError) or (
-                hasattr(e, '__cause__') and e.__cause__ and isinstance(e.__cause__, ImportError)
-            )
-            # 检查错误信息是否包含"未安装"
-            has_install_msg = "未安装" in error_msg or "not installed" in error_msg.lower()
-            
-            if is_import_error and ("akshare" in error_msg.lower() or has_install_msg):
-                logger.error(f"获取龙虎榜数据失败: {error_msg}")
-            else:
-                logger.warning(f"获取龙虎榜数据失败（{error_type}）: {error_msg}")
-            return pd.DataFrame()
+            self._log_akshare_error(e, "获取龙虎榜数据失败")
+            return self._EMPTY_DF
 
     def get_lhb_jg_data(self, trade_date: str) -> pd.DataFrame:
         """
@@ -179,34 +258,25 @@ class HotMoneyAkshare(DataSourceBase):
             start_date_obj = datetime.strptime(trade_date, '%Y%m%d') - timedelta(days=10)
             start_date = start_date_obj.strftime('%Y%m%d')
             
-            df = self._run_akshare(
+            df = self._run_akshare_by_date(
                 func_name="stock_lhb_jgmmtj_em",
                 func_kwargs={"start_date": start_date, "end_date": end_date},
-                verbose=False
+                trade_date=trade_date
             )
             
             if df.empty:
                 logger.warning(f"{start_date}到{end_date} 无龙虎榜机构数据")
-                return pd.DataFrame()
+                return self._EMPTY_DF
+            
+            df = self._select_columns(df, self._LHB_JG_COLS)
+            df = _compact(df)
             
             logger.info(f"获取 {start_date}到{end_date} 龙虎榜机构数据成功，{len(df)} 条记录")
             return df
             
         except Exception as e:
-            error_type = type(e).__name__
-            error_msg = str(e) if str(e) else f"{error_type}异常"
-            # 检查是否是真正的 ImportError（akshare未安装）
-            is_import_error = isinstance(e, ImportError) or (
-                hasattr(e, '__cause__') and e.__cause__ and isinstance(e.__cause__, ImportError)
-            )
-            # 检查错误信息是否包含"未安装"
-            has_install_msg = "未安装" in error_msg or "not installed" in error_msg.lower()
-            
-            if is_import_error and ("akshare" in error_msg.lower() or has_install_msg):
-                logger.error(f"获取龙虎榜机构数据失败: {error_msg}")
-            else:
-                logger.warning(f"获取龙虎榜机构数据失败（{error_type}）: {error_msg}")
-            return pd.DataFrame()
+            self._log_akshare_error(e, "获取龙虎榜机构数据失败")
+            return self._EMPTY_DF
 
     def get_concept_data(self) -> pd.DataFrame:
         """
@@ -224,26 +294,17 @@ class HotMoneyAkshare(DataSourceBase):
             
             if df.empty:
                 logger.warning("无概念板块数据")
-                return pd.DataFrame()
+                return self._EMPTY_DF
+            
+            df = self._select_columns(df, self._CONCEPT_COLS)
+            df = _compact(df)
             
             logger.info(f"获取概念板块数据成功，{len(df)} 条记录")
             return df
             
         except Exception as e:
-            error_type = type(e).__name__
-            error_msg = str(e) if str(e) else f"{error_type}异常"
-            # 检查是否是真正的 ImportError（akshare未安装）
-            is_import_error = isinstance(e, ImportError) or (
-                hasattr(e, '__cause__') and e.__cause__ and isinstance(e.__cause__, ImportError)
-            )
-            # 检查错误信息是否包含"未安装"
-            has_install_msg = "未安装" in error_msg or "not installed" in error_msg.lower()
-            
-            if is_import_error and ("akshare" in error_msg.lower() or has_install_msg):
-                logger.error(f"获取概念板块数据失败: {error_msg}")
-            else:
-                logger.warning(f"获取概念板块数据失败（{error_type}）: {error_msg}")
-            return pd.DataFrame()
+            self._log_akshare_error(e, "获取概念板块数据失败")
+            return self._EMPTY_DF
 
     def get_yyb_data(self) -> pd.DataFrame:
         """
@@ -261,26 +322,85 @@ class HotMoneyAkshare(DataSourceBase):
             
             if df.empty:
                 logger.warning("无游资营业部数据")
-                return pd.DataFrame()
+                return self._EMPTY_DF
+            
+            df = self._select_columns(df, self._YYB_COLS)
+            df = _compact(df)
             
             logger.info(f"获取游资营业部数据成功，{len(df)} 条记录")
             return df
             
         except Exception as e:
-            error_type = type(e).__name__
-            error_msg = str(e) if str(e) else f"{error_type}异常"
-            # 检查是否是真正的 ImportError（akshare未安装）
-            is_import_error = isinstance(e, ImportError) or (
-                hasattr(e, '__cause__') and e.__cause__ and isinstance(e.__cause__, ImportError)
-            )
-            # 检查错误信息是否包含"未安装"
-            has_install_msg = "未安装" in error_msg or "not installed" in error_msg.lower()
-            
-            if is_import_error and ("akshare" in error_msg.lower() or has_install_msg):
-                logger.error(f"获取游资营业部数据失败: {error_msg}")
-            else:
-                logger.warning(f"获取游资营业部数据失败（{error_type}）: {error_msg}")
-            return pd.DataFrame()
+            self._log_akshare_error(e, "获取游资营业部数据失败")
+            return self._EMPTY_DF
+
+    @staticmethod
+    def _filter_lhb_by_date(lhb_data: pd.DataFrame, trade_date: str) -> pd.DataFrame:
+        """
+        筛选指定上榜日的龙虎榜数据
+        
+        akshare 返回的上榜日可能是 date 对象或 'YYYY-MM-DD' 字符串，
+        先统一成 'YYYYMMDD' 再用 NumPy 数组比较，避免与 trade_date 格式不一致而永远匹配不到。
+        
+        Args:
+            lhb_data: 龙虎榜 DataFrame（需包含'上榜日'列）
+            trade_date: 交易日期，格式：YYYYMMDD
+            
+        Returns:
+            当日上榜的龙虎榜数据
+        """
+        dates = pd.to_datetime(lhb_data['上榜日'].astype(str), errors='coerce').dt.strftime('%Y%m%d')
+        mask = dates.to_numpy() == trade_date
+        return lhb_data.iloc[mask]
+
+    @staticmethod
+    def _top_n(df: pd.DataFrame, n: int, column: str) -> pd.DataFrame:
+        """
+        按指定列取前 n 大的行（部分排序），列缺失或无法转为数值时退化为前 n 行
+        
+        Args:
+            df: 原始 DataFrame
+            n: 取前 n 行
+            column: 排序依据的列名
+            
+        Returns:
+            前 n 行 DataFrame
+        """
+        if column not in df.columns:
+            return df.iloc[:n]
+        values = pd.to_numeric(df[column], errors='coerce').reset_index(drop=True)
+        if values.isna().all():
+            return df.iloc[:n]
+        return df.iloc[values.nlargest(n).index]
+
+    @staticmethod
+    def _with_up_ratio(concept_data: pd.DataFrame) -> pd.DataFrame:
+        """
+        向量化计算概念板块的上涨家数合计（_up_total）与上涨率（_up_ratio，百分比）
+        
+        Args:
+            concept_data: 概念板块 DataFrame
+            
+        Returns:
+            增加了 _up_total、_up_ratio 两列的 DataFrame
+        """
+        up = concept_data['上涨家数'] if '上涨家数' in concept_data.columns else 0
+        down = concept_data['下跌家数'] if '下跌家数' in concept_data.columns else 0
+        total = pd.Series(up + down, index=concept_data.index)
+        up_ratio = (up / total.where(total > 0) * 100).fillna(0)
+        return concept_data.assign(_up_total=total, _up_ratio=up_ratio)
+
+    def _records_to_frame(self, records: list) -> pd.DataFrame:
+        """
+        将单个分区的记录列表转换为 DataFrame（显式指定列，跳过列推断）
+        
+        Args:
+            records: 记录字典列表
+            
+        Returns:
+            包含 REQUIRED_COLUMNS 列的 DataFrame
+        """
+        return pd.DataFrame.from_records(records, columns=self.REQUIRED_COLUMNS)
 
     def format_fund_flow_summary(self, trade_date: str) -> str:
         """
@@ -301,7 +421,7 @@ class HotMoneyAkshare(DataSourceBase):
             concept_data = self.get_concept_data()
             yyb_data = self.get_yyb_data()
             
-            sections = [f"## {trade_date} 资金流数据摘要\n"]
+            sections = [_SUMMARY_HEADER_TMPL.format(trade_date=trade_date)]
             
             # 一、涨跌停情况
             if not zt_data.empty or not dt_data.empty:
@@ -311,29 +431,31 @@ class HotMoneyAkshare(DataSourceBase):
                     zt_count = len(zt_data)
                     # 连板股统计
                     if '连板数' in zt_data.columns:
-                        lianbao_stats = zt_data['连板数'].value_counts().sort_index(ascending=False)
+                        lianbao_counter = Counter(zt_data['连板数'].dropna().to_numpy().tolist())
+                        lianbao_stats = dict(sorted(lianbao_counter.items(), reverse=True))
                         sections.append(f"**涨停股票**: 共{zt_count}只")
-                        sections.append(f"**连板分布**: {dict(lianbao_stats)}")
-                        top_zt = zt_data.head(5)
+                        sections.append(f"**连板分布**: {lianbao_stats}")
                         sections.append("**主要涨停股票**:")
-                        for _, row in top_zt.iterrows():
-                            sections.append(
-                                f"- {row.get('名称', 'N/A')}({row.get('代码', 'N/A')}): "
-                                f"{row.get('涨跌幅', 0):.2f}%, "
-                                f"连板{row.get('连板数', 0)}天, "
-                                f"炸板{row.get('炸板次数', 0)}次"
+                        sections.extend(
+                            _ZT_LINE_TMPL.format(
+                                name=row.get('名称', 'N/A'), code=row.get('代码', 'N/A'),
+                                change_rate=row.get('涨跌幅', 0), lianban=row.get('连板数', 0),
+                                zaban=row.get('炸板次数', 0)
                             )
+                            for row in zt_data.head(5).to_dict('records')
+                        )
                 
                 if not dt_data.empty:
                     dt_count = len(dt_data)
                     sections.append(f"**跌停股票**: 共{dt_count}只")
                     if dt_count <= 5:
-                        for _, row in dt_data.iterrows():
-                            sections.append(
-                                f"- {row.get('名称', 'N/A')}({row.get('代码', 'N/A')}): "
-                                f"{row.get('涨跌幅', 0):.2f}%, "
-                                f"连续跌停{row.get('连续跌停', 0)}天"
+                        sections.extend(
+                            _DT_LINE_TMPL.format(
+                                name=row.get('名称', 'N/A'), code=row.get('代码', 'N/A'),
+                                change_rate=row.get('涨跌幅', 0), lianxu_dt=row.get('连续跌停', 0)
                             )
+                            for row in dt_data.to_dict('records')
+                        )
                 sections.append("")  # 空行
             
             # 二、龙虎榜活跃度
@@ -342,21 +464,20 @@ class HotMoneyAkshare(DataSourceBase):
                 
                 lhb_count = len(lhb_data)
                 # 按上榜日期统计最近几天的数据
-                recent_lhb = lhb_data[lhb_data.get('上榜日', '') == trade_date] if '上榜日' in lhb_data.columns else lhb_data
+                recent_lhb = self._filter_lhb_by_date(lhb_data, trade_date) if '上榜日' in lhb_data.columns else lhb_data
                 recent_count = len(recent_lhb)
                 
                 sections.append(f"**龙虎榜上榜股票**: 近10天共{lhb_count}只，{trade_date}当日{recent_count}只")
                 
                 if not recent_lhb.empty and recent_count <= 10:
                     sections.append("**当日主要龙虎榜股票**:")
-                    for _, row in recent_lhb.head(5).iterrows():
+                    for row in recent_lhb.head(5).to_dict('records'):
                         net_buy = row.get('龙虎榜净买额', 0)
                         net_buy_str = f"{net_buy/10000:.0f}万" if abs(net_buy) < 100000000 else f"{net_buy/100000000:.2f}亿"
-                        sections.append(
-                            f"- {row.get('名称', 'N/A')}({row.get('代码', 'N/A')}): "
-                            f"{row.get('涨跌幅', 0):.2f}%, "
-                            f"净买额{net_buy_str}"
-                        )
+                        sections.append(_LHB_LINE_TMPL.format(
+                            name=row.get('名称', 'N/A'), code=row.get('代码', 'N/A'),
+                            change_rate=row.get('涨跌幅', 0), net_buy=net_buy_str
+                        ))
                 sections.append("")  # 空行
             
             # 三、机构参与情况
@@ -364,38 +485,40 @@ class HotMoneyAkshare(DataSourceBase):
                 sections.append("### 三、机构参与情况\n")
                 
                 jg_count = len(lhb_jg_data)
-                total_net_buy = lhb_jg_data['机构买入净额'].sum() if '机构买入净额' in lhb_jg_data.columns else 0
+                total_net_buy = 0.0
+                if '机构买入净额' in lhb_jg_data.columns:
+                    # akshare 偶尔返回 object 列，先统一转成数值再用 NumPy 求和（跳过 NaN）
+                    net_buy_amounts = pd.to_numeric(lhb_jg_data['机构买入净额'], errors='coerce').to_numpy(dtype='float64')
+                    total_net_buy = float(np.nansum(net_buy_amounts))
                 
                 sections.append(f"**机构参与股票**: {jg_count}只")
                 sections.append(f"**机构净买入**: {total_net_buy/100000000:.2f}亿元")
                 
-                top_jg = lhb_jg_data.head(3)
+                top_jg = self._top_n(lhb_jg_data, 3, '机构买入净额')
                 if not top_jg.empty:
                     sections.append("**主要机构参与股票**:")
-                    for _, row in top_jg.iterrows():
-                        net_buy = row.get('机构买入净额', 0)
-                        sections.append(
-                            f"- {row.get('名称', 'N/A')}: "
-                            f"机构净买额{net_buy/10000:.0f}万元"
+                    sections.extend(
+                        _JG_LINE_TMPL.format(
+                            name=row.get('名称', 'N/A'), net_buy_wan=row.get('机构买入净额', 0) / 10000
                         )
+                        for row in top_jg.to_dict('records')
+                    )
                 sections.append("")  # 空行
             
             # 四、概念板块热度
             if not concept_data.empty:
                 sections.append("### 四、概念板块热度\n")
                 
-                top_concepts = concept_data.head(5)
+                top_concepts = self._with_up_ratio(self._top_n(concept_data, 5, '涨跌幅'))
                 sections.append("**热门概念板块**:")
-                for _, row in top_concepts.iterrows():
-                    up_count = row.get('上涨家数', 0)
-                    down_count = row.get('下跌家数', 0)
-                    total_count = up_count + down_count
-                    up_ratio = (up_count / total_count * 100) if total_count > 0 else 0
-                    sections.append(
-                        f"- {row.get('板块名称', 'N/A')}: "
-                        f"{row.get('涨跌幅', 0):.2f}%, "
-                        f"上涨率{up_ratio:.0f}%({up_count}/{total_count})"
+                sections.extend(
+                    _CONCEPT_LINE_TMPL.format(
+                        name=row.get('板块名称', 'N/A'), change_rate=row.get('涨跌幅', 0),
+                        up_ratio=row['_up_ratio'], up_count=row.get('上涨家数', 0),
+                        total_count=row['_up_total']
                     )
+                    for row in top_concepts.to_dict('records')
+                )
                 sections.append("")  # 空行
             
             # 五、游资营业部活跃度
@@ -405,16 +528,16 @@ class HotMoneyAkshare(DataSourceBase):
                 yyb_count = len(yyb_data)
                 sections.append(f"**活跃游资营业部**: {yyb_count}家")
                 
-                top_yyb = yyb_data.head(3)
+                top_yyb = self._top_n(yyb_data, 3, '今日最高金额')
                 if not top_yyb.empty:
                     sections.append("**主要活跃营业部**:")
-                    for _, row in top_yyb.iterrows():
-                        yyb_name = row.get('营业部名称', 'N/A')
-                        sections.append(
-                            f"- {yyb_name}: "
-                            f"今日操作{row.get('今日最高操作', 0)}次, "
-                            f"最高金额{row.get('今日最高金额', 0)}"
+                    sections.extend(
+                        _YYB_LINE_TMPL.format(
+                            name=row.get('营业部名称', 'N/A'), ops=row.get('今日最高操作', 0),
+                            amount=row.get('今日最高金额', 0)
                         )
+                        for row in top_yyb.to_dict('records')
+                    )
             
             return "\n".join(sections)
             
@@ -439,11 +562,20 @@ class HotMoneyAkshare(DataSourceBase):
             trade_date = get_previous_trading_date(trigger_time)
             logger.info(f"获取 {trade_date} 的资金流数据（trigger_time: {trigger_time}）")
             
-            all_records = []
+            # 各类数据相互独立，放到线程池中并发获取（akshare 为同步阻塞调用）
+            zt_data, dt_data, lhb_data, concept_data, lhb_jg_data = await asyncio.gather(
+                asyncio.to_thread(self.get_zt_data, trade_date),
+                asyncio.to_thread(self.get_dt_data, trade_date),
+                asyncio.to_thread(self.get_lhb_data, trade_date),
+                asyncio.to_thread(self.get_concept_data),
+                asyncio.to_thread(self.get_lhb_jg_data, trade_date),
+            )
+            
+            section_frames = []
             
             # 1. 涨停股票 - 每条股票一条记录
-            zt_data = self.get_zt_data(trade_date)
             if not zt_data.empty:
+                records = []
                 for _, row in zt_data.iterrows():
                     try:
                         stock_name = row.get('名称', 'N/A')
@@ -462,7 +594,7 @@ class HotMoneyAkshare(DataSourceBase):
                         if '封单金额' in row:
                             content += f"封单金额: {row.get('封单金额', 0):.0f}万元\n"
                         
-                        all_records.append({
+                        records.append({
                             "title": f"{trade_date} 涨停股票: {stock_name}({stock_code})",
                             "content": content,
                             "pub_time": trigger_time,
@@ -471,10 +603,11 @@ class HotMoneyAkshare(DataSourceBase):
                     except Exception as e:
                         logger.warning(f"处理涨停股票数据失败: {e}")
                         continue
+                section_frames.append(self._records_to_frame(records))
             
             # 2. 跌停股票 - 每条股票一条记录
-            dt_data = self.get_dt_data(trade_date)
             if not dt_data.empty:
+                records = []
                 for _, row in dt_data.iterrows():
                     try:
                         stock_name = row.get('名称', 'N/A')
@@ -489,7 +622,7 @@ class HotMoneyAkshare(DataSourceBase):
                         content += f"涨跌幅: {change_rate:.2f}%\n"
                         content += f"连续跌停: {lianxu_dt}天\n"
                         
-                        all_records.append({
+                        records.append({
                             "title": f"{trade_date} 跌停股票: {stock_name}({stock_code})",
                             "content": content,
                             "pub_time": trigger_time,
@@ -498,16 +631,17 @@ class HotMoneyAkshare(DataSourceBase):
                     except Exception as e:
                         logger.warning(f"处理跌停股票数据失败: {e}")
                         continue
+                section_frames.append(self._records_to_frame(records))
             
             # 3. 龙虎榜股票 - 每条股票一条记录（只取当日数据）
-            lhb_data = self.get_lhb_data(trade_date)
             if not lhb_data.empty:
                 # 筛选当日数据
                 if '上榜日' in lhb_data.columns:
-                    today_lhb = lhb_data[lhb_data['上榜日'] == trade_date]
+                    today_lhb = self._filter_lhb_by_date(lhb_data, trade_date)
                 else:
-                    today_lhb = lhb_data.head(20)  # 如果没有日期列，取前20条
+                    today_lhb = lhb_data.iloc[:20]  # 如果没有日期列，取前20条
                 
+                records = []
                 for _, row in today_lhb.iterrows():
                     try:
                         stock_name = row.get('名称', 'N/A')
@@ -527,7 +661,7 @@ class HotMoneyAkshare(DataSourceBase):
                             sell_amount = row.get('卖出额', 0)
                             content += f"卖出额: {sell_amount/10000:.0f}万元\n"
                         
-                        all_records.append({
+                        records.append({
                             "title": f"{trade_date} 龙虎榜: {stock_name}({stock_code})",
                             "content": content,
                             "pub_time": trigger_time,
@@ -536,19 +670,19 @@ class HotMoneyAkshare(DataSourceBase):
                     except Exception as e:
                         logger.warning(f"处理龙虎榜数据失败: {e}")
                         continue
+                section_frames.append(self._records_to_frame(records))
             
             # 4. 概念板块 - 每个板块一条记录（取前20个）
-            concept_data = self.get_concept_data()
             if not concept_data.empty:
-                top_concepts = concept_data.head(20)
-                for _, row in top_concepts.iterrows():
+                top_concepts = self._with_up_ratio(self._top_n(concept_data, 20, '涨跌幅'))
+                records = []
+                for row in top_concepts.to_dict('records'):
                     try:
                         concept_name = row.get('板块名称', 'N/A')
                         change_rate = row.get('涨跌幅', 0)
                         up_count = row.get('上涨家数', 0)
                         down_count = row.get('下跌家数', 0)
-                        total_count = up_count + down_count
-                        up_ratio = (up_count / total_count * 100) if total_count > 0 else 0
+                        up_ratio = row['_up_ratio']
                         
                         content = f"板块名称: {concept_name}\n"
                         content += f"涨跌幅: {change_rate:.2f}%\n"
@@ -559,7 +693,7 @@ class HotMoneyAkshare(DataSourceBase):
                             market_cap = row.get('总市值', 0) / 100000000
                             content += f"总市值: {market_cap:.0f}亿元\n"
                         
-                        all_records.append({
+                        records.append({
                             "title": f"{trade_date} 概念板块: {concept_name}",
                             "content": content,
                             "pub_time": trigger_time,
@@ -568,11 +702,12 @@ class HotMoneyAkshare(DataSourceBase):
                     except Exception as e:
                         logger.warning(f"处理概念板块数据失败: {e}")
                         continue
+                section_frames.append(self._records_to_frame(records))
             
             # 5. 机构参与股票 - 每条股票一条记录（取前10个）
-            lhb_jg_data = self.get_lhb_jg_data(trade_date)
             if not lhb_jg_data.empty:
-                top_jg = lhb_jg_data.head(10)
+                top_jg = self._top_n(lhb_jg_data, 10, '机构买入净额')
+                records = []
                 for _, row in top_jg.iterrows():
                     try:
                         stock_name = row.get('名称', 'N/A')
@@ -584,7 +719,7 @@ class HotMoneyAkshare(DataSourceBase):
                         content += f"股票名称: {stock_name}\n"
                         content += f"机构买入净额: {net_buy_str}\n"
                         
-                        all_records.append({
+                        records.append({
                             "title": f"{trade_date} 机构参与: {stock_name}({stock_code})",
                             "content": content,
                             "pub_time": trigger_time,
@@ -593,33 +728,48 @@ class HotMoneyAkshare(DataSourceBase):
                     except Exception as e:
                         logger.warning(f"处理机构参与数据失败: {e}")
                         continue
+                section_frames.append(self._records_to_frame(records))
             
             # 如果没有数据，至少返回一条汇总记录
-            if not all_records:
-                summary = self.format_fund_flow_summary(trade_date)
-                all_records.append({
+            section_frames = [frame for frame in section_frames if not frame.empty]
+            if not section_frames:
+                summary = await asyncio.to_thread(self.format_fund_flow_summary, trade_date)
+                section_frames.append(self._records_to_frame([{
                     "title": f"{trade_date}:资金流数据汇总",
                     "content": summary,
                     "pub_time": trigger_time,
                     "url": f"akshare://fund_flow_summary/{trade_date}"
-                })
+                }]))
             
-            df = pd.DataFrame(all_records)
+            df = pd.concat(section_frames, ignore_index=True)
             logger.info(f"成功获取资金流数据: {trade_date}，共 {len(df)} 条记录")
             return df
                 
         except Exception as e:
             logger.error(f"获取资金流数据失败: {e}")
-            return pd.DataFrame(columns=self.REQUIRED_COLUMNS)
+            return self._EMPTY_RESULT_DF.copy()
 
 
 if __name__ == "__main__":
-    # 测试代码
-    hot_money = HotMoneyAkshare()
-    trigger_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    df = asyncio.run(hot_money.fetch_data_async(trigger_time))
-    print(f"获取到 {len(df)} 条记录")
-    if not df.empty:
-        print("\n内容预览:")
-        print(df['content'].values[0][:500])
+    # 测试代码：python -m holisticaquant.dataflows.datasource.hot_money_akshare smoke [--uvloop]
+    import sys
+    
+    if len(sys.argv) > 1 and sys.argv[1] == "smoke":
+        run = asyncio.run
+        if "--uvloop" in sys.argv:
+            try:
+                import uvloop
+                run = uvloop.run
+            except ImportError:
+                logger.warning("未安装 uvloop，使用默认事件循环")
+        
+        hot_money = HotMoneyAkshare()
+        trigger_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        df = run(hot_money.fetch_data_async(trigger_time))
+        print(f"获取到 {len(df)} 条记录")
+        if not df.empty:
+            print("\n内容预览:")
+            print(df['content'].values[0][:500])
+    else:
+        print("用法: python -m holisticaquant.dataflows.datasource.hot_money_akshare smoke [--uvloop]")
 
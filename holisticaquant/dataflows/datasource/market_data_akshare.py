@@ -4,8 +4,12 @@
 整合K线数据、板块资金流向等，生成市场分析
 注意：此版本不包含 LLM 总结，只返回格式化的数据文本
 """
+import numpy as np
 import pandas as pd
 import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from loguru import logger
@@ -15,6 +19,116 @@ from ..utils.akshare_utils import akshare_cached
 from ..utils.date_utils import get_previous_trading_date
 
 
+# 板块数据用到的列（按格式化顺序）：akshare 中文列名 -> ASCII 列名
+# 取数后立即重命名一次，之后逐行访问只用 ASCII 属性/键
+_SECTOR_COLS = {
+    '板块名称': 'sector_name',
+    '最新价': 'latest_price',
+    '涨跌额': 'change_amount',
+    '涨跌幅': 'change_rate',
+    '总市值': 'market_cap',
+    '换手率': 'turnover_rate',
+    '上涨家数': 'up_count',
+    '下跌家数': 'down_count',
+    '领涨股票': 'leading_stock',
+    '领涨股票-涨跌幅': 'leading_change'
+}
+
+# 缺列时的默认值（_prepare_top_sectors 用默认值补齐缺失的列）
+_SECTOR_TEXT_DEFAULT = 'N/A'
+_SECTOR_TEXT_COLS = ('sector_name', 'leading_stock')
+
+
+def _prepare_top_sectors(df: pd.DataFrame, n: int) -> pd.DataFrame:
+    """
+    取前 n 个板块并预先计算展示用的派生列
+    
+    只保留 _SECTOR_COLS 中的列并改为 ASCII 列名，再整列计算总市值（亿元）与涨跌符号，
+    逐行格式化时不再做任何算术。参与计算的列先按数值解析（无法解析的值记为 NaN），
+    个别异常值只影响所在行的展示，不会让整列计算失败。
+    
+    Args:
+        df: stock_board_industry_name_em 返回的 DataFrame
+        n: 取前几个板块
+        
+    Returns:
+        含 market_cap_yi、change_sign、rate_sign 列的小 DataFrame
+    """
+    top = df.head(n)[[c for c in _SECTOR_COLS if c in df.columns]].rename(columns=_SECTOR_COLS)
+    # 缺失的列补默认值（文本列 'N/A'，数值列 0）
+    missing = {
+        col: _SECTOR_TEXT_DEFAULT if col in _SECTOR_TEXT_COLS else 0
+        for col in _SECTOR_COLS.values() if col not in top.columns
+    }
+    if missing:
+        top = top.assign(**missing)
+    market_cap = pd.to_numeric(top['market_cap'], errors='coerce').to_numpy(dtype='float64')
+    change_amount = pd.to_numeric(top['change_amount'], errors='coerce').to_numpy(dtype='float64')
+    change_rate = pd.to_numeric(top['change_rate'], errors='coerce').to_numpy(dtype='float64')
+    return top.assign(
+        market_cap_yi=market_cap / 100000000,  # 转换为亿元
+        change_sign=np.where(change_amount >= 0, "+", ""),
+        rate_sign=np.where(change_rate >= 0, "+", "")
+    )
+
+
+class _FetchContext:
+    """
+    单次请求内的数据获取备忘
+    
+    同一接口、同一参数在一次 get_data / format_market_summary 中只获取一次，
+    失败的获取也会记住异常，后续读取直接重新抛出，不再重复请求。
+    """
+    
+    def __init__(self, ds: "MarketDataAkshare"):
+        self._ds = ds
+        self._cache = {}
+        # 每个 key 一把锁：不同数据可并发获取，同一数据只获取一次
+        self._locks = {}
+    
+    def _memo(self, key: tuple, fetch):
+        with self._locks.setdefault(key, threading.Lock()):
+            if key not in self._cache:
+                try:
+                    self._cache[key] = (fetch(), None)
+                except Exception as e:
+                    self._cache[key] = (None, e)
+            result, error = self._cache[key]
+        if error is not None:
+            raise error
+        return result
+    
+    def get(self, func_name: str, **func_kwargs):
+        """
+        获取 akshare 函数结果（命中备忘时直接返回）
+        
+        Args:
+            func_name: akshare 函数名
+            **func_kwargs: 函数参数
+            
+        Returns:
+            akshare 函数返回的结果
+        """
+        key = (func_name, tuple(sorted(func_kwargs.items())))
+        return self._memo(key, lambda: self._ds._run_akshare(
+            func_name=func_name,
+            func_kwargs=func_kwargs,
+            verbose=False
+        ))
+    
+    def index_df(self, symbol: str) -> pd.DataFrame:
+        """
+        获取指数日线历史数据（见 MarketDataAkshare._get_index_df）
+        
+        Args:
+            symbol: akshare 指数代码，如 sh000001
+            
+        Returns:
+            指数日线 DataFrame
+        """
+        return self._memo(("index_df", symbol), lambda: self._ds._get_index_df(symbol))
+
+
 class MarketDataAkshare(DataSourceBase):
     """
     市场数据源（基于 akshare）
@@ -22,6 +136,19 @@ class MarketDataAkshare(DataSourceBase):
     获取三大指数K线数据、当日数据、板块资金流向等
     """
     
+    # 三大指数：代码 -> akshare symbol 与名称
+    _INDICES = {
+        "000001.SH": {"symbol": "sh000001", "name": "上证指数"},
+        "399006.SZ": {"symbol": "sz399006", "name": "创业板指"},
+        "000688.SH": {"symbol": "sh000688", "name": "科创50"}
+    }
+    
+    # 指数日线中实际用到的列
+    _INDEX_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'volume']
+    
+    # 指数日线内存缓存有效期（秒）
+    INDEX_CACHE_TTL = 300
+    
     def __init__(self, 
                  max_size_kb: Optional[float] = 512.0,
                  max_time_range_days: Optional[int] = 7,
@@ -37,60 +164,113 @@ class MarketDataAkshare(DataSourceBase):
         super().__init__("market_data_akshare", max_size_kb=max_size_kb,
                         max_time_range_days=max_time_range_days,
                         max_records=max_records, use_cache=use_cache)
+        # 指数日线数据的短期内存缓存：symbol -> (获取时间, DataFrame)
+        # get_kline_data 与 get_current_day_data 使用同一份指数历史，避免重复请求
+        self._index_df_cache = {}
+        # 每个 symbol 一把锁，保证并发调用时同一指数只请求一次
+        self._index_df_locks = {}
+    
+    def _get_index_df(self, symbol: str) -> pd.DataFrame:
+        """
+        获取指数日线历史数据（带 TTL 内存缓存）
+        
+        返回的 DataFrame 中 date 列已转换为 datetime 并按升序排列，调用方不应修改它。
+        
+        Args:
+            symbol: akshare 指数代码，如 sh000001
+            
+        Returns:
+            指数日线 DataFrame
+        """
+        with self._index_df_locks.setdefault(symbol, threading.Lock()):
+            cached = self._index_df_cache.get(symbol)
+            if cached is not None and time.monotonic() - cached[0] < self.INDEX_CACHE_TTL:
+                return cached[1]
+            
+            df = self._run_akshare(
+                func_name="stock_zh_index_daily",
+                func_kwargs={"symbol": symbol},
+                verbose=False
+            )
+            
+            if not df.empty:
+                # 只保留用到的列（同时得到独立副本），后续转换与筛选只处理窄表
+                df = df[self._INDEX_COLUMNS].copy()
+                df['date'] = pd.to_datetime(df['date'])
+                # 保证按日期升序，调用方可直接用 searchsorted 二分定位
+                if not df['date'].is_monotonic_increasing:
+                    df = df.sort_values('date', ignore_index=True)
+                self._index_df_cache[symbol] = (time.monotonic(), df)
+            return df
+    
+    async def _prefetch_index_dfs(self, ctx: _FetchContext) -> None:
+        """
+        并发预取三大指数日线数据，填充 ctx
         
-    def get_kline_data(self, trade_date: str) -> dict:
+        获取失败的异常已记在 ctx 中，由后续同步调用各自记录日志，这里忽略异常。
+        """
+        await asyncio.gather(
+            *(asyncio.to_thread(ctx.index_df, info["symbol"]) for info in self._INDICES.values()),
+            return_exceptions=True
+        )
+    
+    async def _get_current_day_data_async(self, trade_date: str, ctx: _FetchContext) -> dict:
+        """
+        异步获取三大指数当日数据：先并发预取指数历史，再在线程中整理结果
+        
+        Args:
+            trade_date: 交易日期，格式：YYYYMMDD
+            ctx: 请求级调用备忘
+            
+        Returns:
+            包含三大指数当日数据的字典
+        """
+        await self._prefetch_index_dfs(ctx)
+        return await asyncio.to_thread(self.get_current_day_data, trade_date, ctx)
+        
+    def get_kline_data(self, trade_date: str, ctx: Optional[_FetchContext] = None) -> dict:
         """
         获取三大指数的K线数据
         
         Args:
             trade_date: 交易日期，格式：YYYYMMDD
+            ctx: 请求级调用备忘，None 表示新建
             
         Returns:
             包含三大指数K线数据的字典
         """
         try:
-            indices = {
-                "000001.SH": {"symbol": "sh000001", "name": "上证指数"},
-                "399006.SZ": {"symbol": "sz399006", "name": "创业板指"},
-                "000688.SH": {"symbol": "sh000688", "name": "科创50"}
-            }
-            
+            ctx = ctx or _FetchContext(self)
             kline_data = {}
+            # 目标日期只解析一次，与 datetime64 列比较时无需逐次转换
+            target_date = pd.Timestamp(datetime.strptime(trade_date, '%Y%m%d'))
             
-            for stock_code, info in indices.items():
+            for stock_code, info in self._INDICES.items():
                 try:
                     # 获取指数历史数据
-                    df = self._run_akshare(
-                        func_name="stock_zh_index_daily",
-                        func_kwargs={"symbol": info["symbol"]},
-                        verbose=False
-                    )
+                    df = ctx.index_df(info["symbol"])
                     
                     if df.empty:
                         logger.warning(f"{info['name']} 数据为空")
                         continue
                     
-                    # 转换日期格式并筛选最近90天的数据
-                    df['date'] = pd.to_datetime(df['date'])
-                    target_date = datetime.strptime(trade_date, '%Y%m%d')
-                    
-                    filtered_df = df[df['date'] <= target_date].tail(90)
+                    # 筛选最近90天的数据：date 已升序，二分定位截止位置
+                    end = int(df['date'].searchsorted(target_date, side='right'))
+                    filtered_df = df.iloc[max(0, end - 90):end]
                     
                     if filtered_df.empty:
                         logger.warning(f"{info['name']} 无{trade_date}之前的数据")
                         continue
                     
-                    # 转换为所需格式
-                    data_list = []
-                    for _, row in filtered_df.iterrows():
-                        data_list.append({
-                            'trade_date': row['date'].strftime('%Y%m%d'),
-                            'open_price': float(row['open']),
-                            'high_price': float(row['high']),
-                            'low_price': float(row['low']),
-                            'close_price': float(row['close']),
-                            'trade_lots': int(row['volume'])
-                        })
+                    # 转换为所需格式（整列转换，避免逐行 iterrows）
+                    data_list = pd.DataFrame({
+                        'trade_date': filtered_df['date'].dt.strftime('%Y%m%d').to_numpy(),
+                        'open_price': filtered_df['open'].astype('float64').to_numpy(),
+                        'high_price': filtered_df['high'].astype('float64').to_numpy(),
+                        'low_price': filtered_df['low'].astype('float64').to_numpy(),
+                        'close_price': filtered_df['close'].astype('float64').to_numpy(),
+                        'trade_lots': filtered_df['volume'].astype('int64').to_numpy()
+                    }).to_dict('records')
                     
                     kline_data[stock_code] = {
                         'name': info['name'],
@@ -100,94 +280,52 @@ class MarketDataAkshare(DataSourceBase):
                     logger.info(f"获取 {info['name']} K线数据成功，{len(data_list)} 条记录")
                     
                 except Exception as e:
-                    error_type = type(e).__name__
-                    error_msg = str(e) if str(e) else f"{error_type}异常（无详细信息）"
-                    # 如果错误信息为空或None，使用异常类型
-                    if not error_msg or error_msg == "None":
-                        error_msg = f"{error_type}异常"
-                    # 检查是否是真正的 ImportError（akshare未安装）
-                    is_import_error = isinstance(e, ImportError) or (
-                        hasattr(e, '__cause__') and e.__cause__ and isinstance(e.__cause__, ImportError)
-                    )
-                    # 检查错误信息是否包含"未安装"
-                    has_install_msg = "未安装" in error_msg or "not installed" in error_msg.lower()
-                    
-                    if is_import_error and ("akshare" in error_msg.lower() or has_install_msg):
-                        logger.error(f"获取 {info['name']} K线数据失败: {error_msg}")
-                    else:
-                        logger.warning(f"获取 {info['name']} K线数据失败（{error_type}）: {error_msg}")
+                    self._log_akshare_error(e, f"获取 {info['name']} K线数据失败")
                     continue
             
             return kline_data
             
         except Exception as e:
-            error_type = type(e).__name__
-            error_msg = str(e) if str(e) else f"{error_type}异常"
-            # 检查是否是真正的 ImportError（akshare未安装）
-            is_import_error = isinstance(e, ImportError) or (
-                hasattr(e, '__cause__') and e.__cause__ and isinstance(e.__cause__, ImportError)
-            )
-            # 检查错误信息是否包含"未安装"
-            has_install_msg = "未安装" in error_msg or "not installed" in error_msg.lower()
-            
-            if is_import_error and ("akshare" in error_msg.lower() or has_install_msg):
-                logger.error(f"获取K线数据失败: {error_msg}")
-            else:
-                logger.warning(f"获取K线数据失败（{error_type}）: {error_msg}")
+            self._log_akshare_error(e, "获取K线数据失败")
             return {}
     
-    def get_current_day_data(self, trade_date: str) -> dict:
+    def get_current_day_data(self, trade_date: str, ctx: Optional[_FetchContext] = None) -> dict:
         """
         获取三大指数当日收盘数据
         
         Args:
             trade_date: 交易日期，格式：YYYYMMDD
+            ctx: 请求级调用备忘，None 表示新建
             
         Returns:
             包含三大指数当日数据的字典
         """
         try:
-            indices = {
-                "000001.SH": {"symbol": "sh000001", "name": "上证指数"},
-                "399006.SZ": {"symbol": "sz399006", "name": "创业板指"},
-                "000688.SH": {"symbol": "sh000688", "name": "科创50"}
-            }
-            
+            ctx = ctx or _FetchContext(self)
             current_day_data = {}
+            # 目标日期只解析一次，与 datetime64 列比较时无需逐次转换
+            target_date = pd.Timestamp(datetime.strptime(trade_date, '%Y%m%d'))
             
-            for stock_code, info in indices.items():
+            for stock_code, info in self._INDICES.items():
                 try:
                     # 获取指数历史数据
-                    df = self._run_akshare(
-                        func_name="stock_zh_index_daily",
-                        func_kwargs={"symbol": info["symbol"]},
-                        verbose=False
-                    )
+                    df = ctx.index_df(info["symbol"])
                     
                     if df.empty:
                         logger.warning(f"{info['name']} 数据为空")
                         continue
                     
-                    # 转换日期格式并查找指定日期的数据
-                    df['date'] = pd.to_datetime(df['date'])
-                    target_date = datetime.strptime(trade_date, '%Y%m%d')
-                    
-                    # 查找指定日期的数据
-                    target_row = df[df['date'] == target_date]
-                    
-                    if target_row.empty:
-                        # 如果没有当日数据，取最近的一条数据
-                        target_row = df[df['date'] <= target_date].tail(1)
-                        if target_row.empty:
-                            logger.warning(f"{info['name']} 无{trade_date}的数据")
-                            continue
+                    # date 已升序：定位不晚于目标日期的最后一行（没有当日数据时即最近的一条）
+                    i = int(df['date'].searchsorted(target_date, side='right')) - 1
+                    if i < 0:
+                        logger.warning(f"{info['name']} 无{trade_date}的数据")
+                        continue
                     
-                    row = target_row.iloc[0]
+                    row = df.iloc[i]
                     
                     # 计算涨跌幅（需要前一天的数据）
-                    prev_row = df[df['date'] < row['date']].tail(1)
-                    if not prev_row.empty:
-                        prev_close = float(prev_row.iloc[0]['close'])
+                    if i > 0:
+                        prev_close = float(df['close'].iat[i - 1])
                         price_change = float(row['close']) - prev_close
                         price_change_rate = price_change / prev_close
                     else:
@@ -209,89 +347,47 @@ class MarketDataAkshare(DataSourceBase):
                     logger.info(f"获取 {info['name']} 当日数据成功")
                     
                 except Exception as e:
-                    error_type = type(e).__name__
-                    error_msg = str(e) if str(e) else f"{error_type}异常（无详细信息）"
-                    # 如果错误信息为空或None，使用异常类型
-                    if not error_msg or error_msg == "None":
-                        error_msg = f"{error_type}异常"
-                    # 检查是否是真正的 ImportError（akshare未安装）
-                    is_import_error = isinstance(e, ImportError) or (
-                        hasattr(e, '__cause__') and e.__cause__ and isinstance(e.__cause__, ImportError)
-                    )
-                    # 检查错误信息是否包含"未安装"
-                    has_install_msg = "未安装" in error_msg or "not installed" in error_msg.lower()
-                    
-                    if is_import_error and ("akshare" in error_msg.lower() or has_install_msg):
-                        logger.error(f"获取 {info['name']} 当日数据失败: {error_msg}")
-                    else:
-                        logger.warning(f"获取 {info['name']} 当日数据失败（{error_type}）: {error_msg}")
+                    self._log_akshare_error(e, f"获取 {info['name']} 当日数据失败")
                     continue
             
             return current_day_data
             
         except Exception as e:
-            error_type = type(e).__name__
-            error_msg = str(e) if str(e) else f"{error_type}异常"
-            # 检查是否是真正的 ImportError（akshare未安装）
-            is_import_error = isinstance(e, ImportError) or (
-                hasattr(e, '__cause__') and e.__cause__ and isinstance(e.__cause__, ImportError)
-            )
-            # 检查错误信息是否包含"未安装"
-            has_install_msg = "未安装" in error_msg or "not installed" in error_msg.lower()
-            
-            if is_import_error and ("akshare" in error_msg.lower() or has_install_msg):
-                logger.error(f"获取当日数据失败: {error_msg}")
-            else:
-                logger.warning(f"获取当日数据失败（{error_type}）: {error_msg}")
+            self._log_akshare_error(e, "获取当日数据失败")
             return {}
     
-    def get_sector_summary(self, trade_date: str) -> str:
+    def get_sector_summary(self, trade_date: str, ctx: Optional[_FetchContext] = None) -> str:
         """
         获取板块资金流向摘要
         
         Args:
             trade_date: 交易日期，格式：YYYYMMDD
+            ctx: 请求级调用备忘，None 表示新建
             
         Returns:
             板块资金流向摘要文本
         """
         try:
             # 获取板块资金流向数据
-            df = self._run_akshare(
-                func_name="stock_board_industry_name_em",
-                func_kwargs={},
-                verbose=False
-            )
+            ctx = ctx or _FetchContext(self)
+            df = ctx.get("stock_board_industry_name_em")
             
             if df.empty:
                 return "无板块资金流向数据"
             
             summary_lines = [f"{trade_date} 板块资金流向情况（东方财富数据）：\n"]
             
-            # 取前10个板块
-            top_sectors = df.head(10)
+            # 取前10个板块（派生列已整列算好、缺失的列补默认值），按 namedtuple 遍历
+            top_sectors = _prepare_top_sectors(df, 10)
             
-            for _, row in top_sectors.iterrows():
+            for row in top_sectors.itertuples(index=False):
                 try:
-                    sector_name = row['板块名称']
-                    latest_price = row['最新价']
-                    change_amount = row['涨跌额']
-                    change_rate = row['涨跌幅']
-                    market_cap = row['总市值'] / 100000000  # 转换为亿元
-                    turnover_rate = row['换手率']
-                    up_count = row['上涨家数']
-                    down_count = row['下跌家数']
-                    leading_stock = row['领涨股票']
-                    leading_change = row['领涨股票-涨跌幅']
-                    
-                    change_sign = "+" if change_amount >= 0 else ""
-                    rate_sign = "+" if change_rate >= 0 else ""
-                    
                     summary_lines.append(
-                        f"**{sector_name}**: 最新价 {latest_price:.2f}, "
-                        f"涨跌 {change_sign}{change_amount:.2f} ({rate_sign}{change_rate:.2f}%), "
-                        f"总市值 {market_cap:.0f}亿, 换手率 {turnover_rate:.2f}%, "
-                        f"上涨 {up_count} 下跌 {down_count}, 领涨股 {leading_stock} ({leading_change:+.2f}%)"
+                        f"**{row.sector_name}**: 最新价 {row.latest_price:.2f}, "
+                        f"涨跌 {row.change_sign}{row.change_amount:.2f} ({row.rate_sign}{row.change_rate:.2f}%), "
+                        f"总市值 {row.market_cap_yi:.0f}亿, 换手率 {row.turnover_rate:.2f}%, "
+                        f"上涨 {row.up_count} 下跌 {row.down_count}, "
+                        f"领涨股 {row.leading_stock} ({row.leading_change:+.2f}%)"
                     )
                 except Exception as e:
                     logger.warning(f"处理板块数据行失败: {e}")
@@ -300,40 +396,31 @@ class MarketDataAkshare(DataSourceBase):
             return "\n".join(summary_lines)
             
         except Exception as e:
-            error_type = type(e).__name__
-            error_msg = str(e) if str(e) else f"{error_type}异常"
-            # 检查是否是真正的 ImportError（akshare未安装）
-            is_import_error = isinstance(e, ImportError) or (
-                hasattr(e, '__cause__') and e.__cause__ and isinstance(e.__cause__, ImportError)
-            )
-            # 检查错误信息是否包含"未安装"
-            has_install_msg = "未安装" in error_msg or "not installed" in error_msg.lower()
-            
-            if is_import_error and ("akshare" in error_msg.lower() or has_install_msg):
-                logger.error(f"获取板块资金流向失败: {error_msg}")
-            else:
-                logger.warning(f"获取板块资金流向失败（{error_type}）: {error_msg}")
+            error_msg = self._log_akshare_error(e, "获取板块资金流向失败")
             return f"获取板块资金流向失败: {error_msg}"
     
-    def format_market_summary(self, trade_date: str) -> str:
+    def format_market_summary(self, trade_date: str, ctx: Optional[_FetchContext] = None) -> str:
         """
         格式化市场数据摘要（不含LLM总结）
         
         Args:
             trade_date: 交易日期，格式：YYYYMMDD
+            ctx: 请求级调用备忘，None 表示新建；get_data 传入自己的 ctx 以复用已获取的板块数据
             
         Returns:
             格式化的市场数据摘要文本
         """
         try:
-            # 获取当日数据
-            current_day_data = self.get_current_day_data(trade_date)
+            ctx = ctx or _FetchContext(self)
+            # 当日数据与板块资金流向相互独立，并发获取
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                current_day_future = executor.submit(self.get_current_day_data, trade_date, ctx)
+                sector_future = executor.submit(self.get_sector_summary, trade_date, ctx)
+                current_day_data = current_day_future.result()
+                sector_summary = sector_future.result()
             
-            # 获取板块资金流向
-            sector_summary = self.get_sector_summary(trade_date)
-            
-            # 获取K线数据（用于统计）
-            kline_data = self.get_kline_data(trade_date)
+            # K线统计与当日数据使用同一份指数历史（已在 ctx 中），当日数据为空时K线必然也为空，直接跳过
+            kline_data = self.get_kline_data(trade_date, ctx) if current_day_data else {}
             
             sections = [f"## {trade_date} 市场数据摘要\n"]
             
@@ -344,14 +431,16 @@ class MarketDataAkshare(DataSourceBase):
                     change_sign = "+" if data['price_change'] >= 0 else ""
                     rate_sign = "+" if data['price_change_rate'] >= 0 else ""
                     
-                    desc = f"**{data['name']}** (代码: {stock_code})\n"
-                    desc += f"- 收盘价: {data['close_price']:.2f}点\n"
-                    desc += f"- 开盘价: {data['open_price']:.2f}点\n"
-                    desc += f"- 最高价: {data['high_price']:.2f}点\n"
-                    desc += f"- 最低价: {data['low_price']:.2f}点\n"
-                    desc += f"- 涨跌幅: {change_sign}{data['price_change']:.2f}点 ({rate_sign}{data['price_change_rate']*100:.2f}%)\n"
-                    desc += f"- 成交额: {data['trade_amount']/100000000:.1f}亿元\n"
-                    desc += f"- 成交量: {data['trade_lots']/10000:.0f}万手\n"
+                    desc = (
+                        f"**{data['name']}** (代码: {stock_code})\n"
+                        f"- 收盘价: {data['close_price']:.2f}点\n"
+                        f"- 开盘价: {data['open_price']:.2f}点\n"
+                        f"- 最高价: {data['high_price']:.2f}点\n"
+                        f"- 最低价: {data['low_price']:.2f}点\n"
+                        f"- 涨跌幅: {change_sign}{data['price_change']:.2f}点 ({rate_sign}{data['price_change_rate']*100:.2f}%)\n"
+                        f"- 成交额: {data['trade_amount']/100000000:.1f}亿元\n"
+                        f"- 成交量: {data['trade_lots']/10000:.0f}万手\n"
+                    )
                     sections.append(desc)
             else:
                 sections.append("### 一、三大指数当日收盘情况\n无数据\n")
@@ -395,80 +484,80 @@ class MarketDataAkshare(DataSourceBase):
             # 获取上一个交易日
             trade_date = get_previous_trading_date(trigger_time)
             logger.info(f"获取 {trade_date} 的市场数据")
+            # 本次请求内的调用备忘：兜底汇总不会再次请求板块数据
+            ctx = _FetchContext(self)
+            
+            # 指数当日数据与板块数据相互独立，并发获取（akshare 为同步阻塞调用）
+            current_day_data, sector_result = await asyncio.gather(
+                self._get_current_day_data_async(trade_date, ctx),
+                asyncio.to_thread(ctx.get, "stock_board_industry_name_em"),
+                return_exceptions=True
+            )
             
-            all_records = []
+            # 每条记录按列分别收集，最后一次性构造 DataFrame
+            titles, contents, pub_times, urls = [], [], [], []
             
             # 1. 三大指数 - 每条指数一条记录
-            current_day_data = self.get_current_day_data(trade_date)
+            if isinstance(current_day_data, Exception):
+                logger.warning(f"获取指数当日数据失败: {current_day_data}")
+                current_day_data = {}
             if current_day_data:
                 for stock_code, data in current_day_data.items():
                     try:
                         change_sign = "+" if data['price_change'] >= 0 else ""
                         rate_sign = "+" if data['price_change_rate'] >= 0 else ""
                         
-                        content = f"指数代码: {stock_code}\n"
-                        content += f"指数名称: {data['name']}\n"
-                        content += f"收盘价: {data['close_price']:.2f}点\n"
-                        content += f"开盘价: {data['open_price']:.2f}点\n"
-                        content += f"最高价: {data['high_price']:.2f}点\n"
-                        content += f"最低价: {data['low_price']:.2f}点\n"
-                        content += f"涨跌: {change_sign}{data['price_change']:.2f}点\n"
-                        content += f"涨跌幅: {rate_sign}{data['price_change_rate']*100:.2f}%\n"
-                        content += f"成交额: {data['trade_amount']/100000000:.1f}亿元\n"
-                        content += f"成交量: {data['trade_lots']/10000:.0f}万手\n"
+                        content = (
+                            f"指数代码: {stock_code}\n"
+                            f"指数名称: {data['name']}\n"
+                            f"收盘价: {data['close_price']:.2f}点\n"
+                            f"开盘价: {data['open_price']:.2f}点\n"
+                            f"最高价: {data['high_price']:.2f}点\n"
+                            f"最低价: {data['low_price']:.2f}点\n"
+                            f"涨跌: {change_sign}{data['price_change']:.2f}点\n"
+                            f"涨跌幅: {rate_sign}{data['price_change_rate']*100:.2f}%\n"
+                            f"成交额: {data['trade_amount']/100000000:.1f}亿元\n"
+                            f"成交量: {data['trade_lots']/10000:.0f}万手\n"
+                        )
                         
-                        all_records.append({
-                            "title": f"{trade_date} 指数数据: {data['name']}({stock_code})",
-                            "content": content,
-                            "pub_time": trigger_time,
-                            "url": f"akshare://index/{stock_code}/{trade_date}"
-                        })
+                        titles.append(f"{trade_date} 指数数据: {data['name']}({stock_code})")
+                        contents.append(content)
+                        pub_times.append(trigger_time)
+                        urls.append(f"akshare://index/{stock_code}/{trade_date}")
                     except Exception as e:
                         logger.warning(f"处理指数数据失败: {e}")
                         continue
             
             # 2. 板块资金流向 - 每个板块一条记录（取前20个）
             try:
-                sector_df = self._run_akshare(
-                    func_name="stock_board_industry_name_em",
-                    func_kwargs={},
-                    verbose=False
-                )
+                if isinstance(sector_result, Exception):
+                    raise sector_result
+                sector_df = sector_result
                 
                 if not sector_df.empty:
-                    top_sectors = sector_df.head(20)
-                    for _, row in top_sectors.iterrows():
+                    # 派生列整列算好、缺失的列补默认值后，一次性转成原生 dict 列表
+                    top_sectors = _prepare_top_sectors(sector_df, 20).to_dict('records')
+                    
+                    for row in top_sectors:
                         try:
-                            sector_name = row.get('板块名称', 'N/A')
-                            latest_price = row.get('最新价', 0)
-                            change_amount = row.get('涨跌额', 0)
-                            change_rate = row.get('涨跌幅', 0)
-                            market_cap = row.get('总市值', 0) / 100000000  # 转换为亿元
-                            turnover_rate = row.get('换手率', 0)
-                            up_count = row.get('上涨家数', 0)
-                            down_count = row.get('下跌家数', 0)
-                            leading_stock = row.get('领涨股票', 'N/A')
-                            leading_change = row.get('领涨股票-涨跌幅', 0)
-                            
-                            change_sign = "+" if change_amount >= 0 else ""
-                            rate_sign = "+" if change_rate >= 0 else ""
+                            sector_name = row['sector_name']
                             
-                            content = f"板块名称: {sector_name}\n"
-                            content += f"最新价: {latest_price:.2f}\n"
-                            content += f"涨跌: {change_sign}{change_amount:.2f}\n"
-                            content += f"涨跌幅: {rate_sign}{change_rate:.2f}%\n"
-                            content += f"总市值: {market_cap:.0f}亿元\n"
-                            content += f"换手率: {turnover_rate:.2f}%\n"
-                            content += f"上涨家数: {up_count}\n"
-                            content += f"下跌家数: {down_count}\n"
-                            content += f"领涨股票: {leading_stock} ({leading_change:+.2f}%)\n"
+                            content = (
+                                f"板块名称: {sector_name}\n"
+                                f"最新价: {row['latest_price']:.2f}\n"
+                                f"涨跌: {row['change_sign']}{row['change_amount']:.2f}\n"
+                                f"涨跌幅: {row['rate_sign']}{row['change_rate']:.2f}%\n"
+                                f"总市值: {row['market_cap_yi']:.0f}亿元\n"
+                                f"换手率: {row['turnover_rate']:.2f}%\n"
+                                f"上涨家数: {row['up_count']}\n"
+                                f"下跌家数: {row['down_count']}\n"
+                                f"领涨股票: {row['leading_stock']} ({row['leading_change']:+.2f}%)\n"
+                            )
                             
-                            all_records.append({
-                                "title": f"{trade_date} 板块资金流向: {sector_name}",
-                                "content": content,
-                                "pub_time": trigger_time,
-                                "url": f"akshare://sector/{sector_name}/{trade_date}"
-                            })
+                            titles.append(f"{trade_date} 板块资金流向: {sector_name}")
+                            contents.append(content)
+                            pub_times.append(trigger_time)
+                            urls.append(f"akshare://sector/{sector_name}/{trade_date}")
                         except Exception as e:
                             logger.warning(f"处理板块数据失败: {e}")
                             continue
@@ -476,16 +565,19 @@ class MarketDataAkshare(DataSourceBase):
                 logger.warning(f"获取板块资金流向失败: {e}")
             
             # 如果没有数据，至少返回一条汇总记录
-            if not all_records:
-                summary = self.format_market_summary(trade_date)
-                all_records.append({
-                    "title": f"{trade_date}:市场宏观数据汇总",
-                    "content": summary,
-                    "pub_time": trigger_time,
-                    "url": f"akshare://market_summary/{trade_date}"
-                })
-            
-            df = pd.DataFrame(all_records)
+            if not titles:
+                summary = self.format_market_summary(trade_date, ctx)
+                titles.append(f"{trade_date}:市场宏观数据汇总")
+                contents.append(summary)
+                pub_times.append(trigger_time)
+                urls.append(f"akshare://market_summary/{trade_date}")
+            
+            df = pd.DataFrame({
+                "title": titles,
+                "content": contents,
+                "pub_time": pub_times,
+                "url": urls
+            })
             logger.info(f"成功获取市场数据: {trade_date}，共 {len(df)} 条记录")
             return df
                 
@@ -8,13 +8,161 @@ import aiohttp
 import re
 import json
 import html
+import random
+import time
+import numpy as np
 import pandas as pd
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from dateutil.tz import tzlocal
+from typing import List, Dict, Any, Optional, Tuple, Callable, Awaitable, TypeVar
 from loguru import logger
 
 from .data_source_base import DataSourceBase
 
+T = TypeVar("T")
+
+# 可选依赖：有 selectolax 时用 C 实现的 HTML 解析器一次解析，否则退回正则提取
+# selectolax 1.0 起只提供 lexbor 后端，旧版本使用 modest 后端
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+    HAS_SELECTOLAX = True
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser
+        HAS_SELECTOLAX = True
+    except ImportError:
+        HTMLParser = None
+        HAS_SELECTOLAX = False
+
+# 可选依赖：有 orjson 时直接解析响应字节，否则用标准库 json（同样接受 bytes）
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# 10~13 位数字字符串视为秒/毫秒时间戳
+_TS_RE = re.compile(r"\d{10,13}")
+
+# 候选的发布时间字段（按优先级）
+_TIME_KEYS = (
+    "ctime", "intime", "mtime", "create_time", "createtime",
+    "pub_time", "pubTime", "pubdate", "pubDate", "time", "update_time",
+)
+
+# 字符串时间的候选格式（按优先级）
+_DATE_FMTS = (
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%d",
+    "%Y/%m/%d %H:%M:%S",
+    "%Y/%m/%d %H:%M",
+    "%Y/%m/%d",
+)
+
+# 时间戳按本地时区解释（与 datetime.fromtimestamp 一致）
+_LOCAL_TZ = tzlocal()
+
+
+def _parse_publish_times(raw: pd.Series) -> pd.Series:
+    """
+    向量化版的 SinaNewsCrawl.normalize_publish_time
+    
+    对整列原始时间值一次性解析：数字（或 10~13 位数字字符串）按秒/毫秒时间戳处理，
+    其余字符串依次尝试 _DATE_FMTS 中的格式。
+    
+    Args:
+        raw: 原始时间值列（见 SinaNewsCrawl.pick_raw_publish_time）
+        
+    Returns:
+        datetime64 列，无法解析的为 NaT
+    """
+    result = pd.Series(pd.NaT, index=raw.index, dtype="datetime64[ns]")
+    if raw.empty:
+        return result
+    
+    kinds = raw.map(type)
+    is_str = kinds.eq(str)
+    texts = raw[is_str].astype(str)
+    is_digit_str = texts.str.fullmatch(_TS_RE.pattern)
+    
+    # 数字时间戳（秒或毫秒）
+    numbers = pd.concat([
+        raw[kinds.isin((int, float, bool))],
+        texts[is_digit_str]
+    ])
+    if not numbers.empty:
+        ts = pd.to_numeric(numbers, errors="coerce").to_numpy(dtype="float64")
+        ts = np.trunc(ts)
+        secs = np.where(ts > 1_000_000_000_000, ts // 1000, ts)
+        # 既不是毫秒也不是 10 位秒级的，取前 10 位
+        long_secs = (ts >= 10_000_000_000) & (ts <= 1_000_000_000_000)
+        if long_secs.any():
+            digits = np.floor(np.log10(ts[long_secs])) + 1
+            secs[long_secs] = ts[long_secs] // 10 ** (digits - 10)
+        # 超出 datetime64[ns] 可表示范围（约 2262 年）的视为无效
+        secs = np.where((secs > 0) & (secs < 9_000_000_000), secs, np.nan)
+        parsed = pd.to_datetime(secs, unit="s", utc=True, errors="coerce")
+        parsed = parsed.tz_convert(_LOCAL_TZ).tz_localize(None)
+        result.loc[numbers.index] = parsed
+    
+    # 常见时间字符串格式
+    texts = texts[~is_digit_str].str.strip()
+    for fmt in _DATE_FMTS:
+        if texts.empty:
+            break
+        parsed = pd.to_datetime(texts, format=fmt, errors="coerce")
+        ok = parsed.notna()
+        result.loc[texts.index[ok]] = parsed[ok]
+        texts = texts[~ok]
+    
+    return result
+
+
+# HTML 处理用的正则（模块加载时编译一次）
+_SCRIPT_STYLE_RE = re.compile(r'<(script|style)[\s\S]*?</\1>', re.I)
+_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+_META_DESC_RE = re.compile(r'<meta[^>]+name=["\']description["\'][^>]+content=["\'](.*?)["\']', re.I | re.S)
+_META_OG_DESC_RE = re.compile(r'<meta[^>]+property=["\']og:description["\'][^>]+content=["\'](.*?)["\']', re.I | re.S)
+_CONTAINER_RES = (
+    re.compile(r'<div[^>]+id=["\']artibody["\'][^>]*>(.*?)</div>', re.I | re.S),
+    re.compile(r'<article[^>]*>(.*?)</article>', re.I | re.S),
+    re.compile(r'<div[^>]+class=["\'][^"\']*(?:article|content)[^"\']*["\'][^>]*>(.*?)</div>', re.I | re.S),
+)
+_PARAGRAPH_RE = re.compile(r'<p[^>]*>(.*?)</p>', re.I | re.S)
+
+# selectolax 提取用的 CSS 选择器（与上面的正则按相同优先级对应）
+_META_DESC_SELECTORS = ('meta[name="description"]', 'meta[property="og:description"]')
+_PARAGRAPH_SELECTORS = (
+    'div#artibody p',
+    'article p',
+    'div[class*="article"] p, div[class*="content"] p',
+    'p',
+)
+
+
+def _strip_jsonp(raw: bytes) -> bytes:
+    """
+    去掉 JSONP 包装（如 callback({...});），纯 JSON 原样返回
+    
+    直接在响应字节上处理：只检查首字节并定位第一个 '(' 与最后一个 ')'，
+    不解码成 str，也不对整个响应做正则扫描。
+    
+    Args:
+        raw: 响应体字节
+        
+    Returns:
+        JSON 字节
+    """
+    raw = raw.strip()
+    if raw and (raw[:1].isalpha() or raw[:1] in b"_$"):
+        left = raw.find(b"(")
+        right = raw.rfind(b")")
+        if 0 < left < right and raw[:left].replace(b"$", b"_").decode("ascii", "replace").isidentifier():
+            return raw[left + 1:right]
+    return raw
+
 
 class SinaNewsCrawl(DataSourceBase):
     """
@@ -23,6 +171,26 @@ class SinaNewsCrawl(DataSourceBase):
     从新浪财经 API 获取新闻数据，返回统一格式的 DataFrame
     """
     
+    # 列表接口的固定查询参数，每页只需覆盖 page
+    FEED_PARAMS = {
+        "pageid": 384,
+        "lid": 2519,
+        "k": "",
+        "num": 50
+    }
+    
+    # 文章内容缓存：url -> (写入时间, 内容)，类级别共享，避免每次新建实例后缓存失效
+    ARTICLE_CACHE_TTL = 600
+    ARTICLE_CACHE_MAXSIZE = 2048
+    _article_cache: Dict[str, Tuple[float, str]] = {}
+    
+    # 请求重试：网络错误、超时及以下状态码按指数退避重试（有 Retry-After 时优先采用）
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+    MAX_RETRIES = 3
+    ARTICLE_MAX_RETRIES = 1  # 文章页只是补全简介，少重试几次，避免拖慢整体
+    RETRY_BASE_DELAY = 0.5
+    RETRY_MAX_DELAY = 30.0
+    
     def __init__(self, start_page: int = 1, end_page: int = 10,
                  max_size_kb: Optional[float] = 1024.0,
                  max_time_range_days: Optional[int] = 7,
@@ -51,35 +219,117 @@ class SinaNewsCrawl(DataSourceBase):
         }
         self.fetch_full_content = True  # 是否抓取文章页以补全内容
         self.article_concurrency = 2  # 控制抓取文章页的并发数
+        # 复用的 HTTP 会话（连接池），首次使用时创建，绑定创建时的事件循环
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """
+        获取复用的 HTTP 会话
+        
+        同一事件循环内多次爬取共用一个连接池，避免重复 TCP/TLS 握手；
+        会话已关闭或事件循环已变化时重新创建。
+        
+        Returns:
+            aiohttp.ClientSession
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=64,
+                limit_per_host=16,
+                keepalive_timeout=120,
+                ttl_dns_cache=300,
+                enable_cleanup_closed=True
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=30),
+                headers=self.headers
+            )
+            self._session_loop = loop
+        return self._session
+    
+    async def aclose(self):
+        """关闭复用的 HTTP 会话（需在创建会话的事件循环中调用）"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+        
+    def _retry_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        计算第 attempt 次（从 0 开始）重试前的等待秒数
+        
+        Retry-After 为整数秒时直接采用，否则按 RETRY_BASE_DELAY * 2**attempt 指数退避并加少量随机抖动，
+        结果不超过 RETRY_MAX_DELAY。
+        """
+        if retry_after and retry_after.strip().isdigit():
+            return min(float(retry_after.strip()), self.RETRY_MAX_DELAY)
+        return min(self.RETRY_BASE_DELAY * 2 ** attempt + random.random() * 0.25, self.RETRY_MAX_DELAY)
+    
+    async def _get_with_retry(self, session: aiohttp.ClientSession, url: str,
+                              read: Callable[[aiohttp.ClientResponse], Awaitable[T]],
+                              max_retries: Optional[int] = None, **kwargs) -> T:
+        """
+        带重试的 GET 请求
+        
+        网络错误、超时以及 RETRY_STATUSES 中的状态码会按 _retry_delay 等待后重试；
+        重试用尽时，异常照常抛出，可重试状态码的响应照常交给 read 处理。
         
+        Args:
+            session: HTTP 会话
+            url: 请求地址
+            read: 读取响应的协程函数（在响应上下文内调用），如 lambda r: r.read()
+            max_retries: 最大重试次数，默认 MAX_RETRIES
+            **kwargs: 透传给 session.get 的参数
+            
+        Returns:
+            read 的返回值
+        """
+        if max_retries is None:
+            max_retries = self.MAX_RETRIES
+        attempt = 0
+        while True:
+            try:
+                async with session.get(url, **kwargs) as resp:
+                    if resp.status not in self.RETRY_STATUSES or attempt >= max_retries:
+                        return await read(resp)
+                    delay = self._retry_delay(attempt, resp.headers.get("Retry-After"))
+                    logger.debug(f"请求 {url} 返回 {resp.status}，{delay:.2f} 秒后重试")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt >= max_retries:
+                    raise
+                delay = self._retry_delay(attempt)
+                logger.debug(f"请求 {url} 失败（{type(e).__name__}），{delay:.2f} 秒后重试")
+            attempt += 1
+            await asyncio.sleep(delay)
+    
     async def fetch_page(self, session: aiohttp.ClientSession, page: int) -> List[Dict[str, Any]]:
-        """异步获取单个页面的数据"""
-        params = {
-            "pageid": 384,
-            "lid": 2519,
-            "k": "",
-            "num": 50,
-            "page": page
-        }
+        """
+        异步获取单个页面的数据
+        
+        session 应来自 _get_session()，请求头由会话统一设置，单个请求不再传 headers。
+        """
+        params = {**self.FEED_PARAMS, "page": page}
         
         try:
-            async with session.get(self.base_url, params=params, headers=self.headers, timeout=15) as response:
-                text = await response.text()
-                
-                # 兼容 JSONP 与纯 JSON
-                m = re.search(r'^\s*[\w$]+\((.*)\)\s*;?\s*$', text.strip(), re.S)
-                json_text = m.group(1) if m else text.strip()
-                data = json.loads(json_text)
-                
-                # 提取items
-                items = self.extract_items(data, page)
-                
-                # 尝试补全内容
-                if self.fetch_full_content and items:
-                    await self.enrich_items_with_full_content(session, items)
-                
-                return items
-                
+            raw = await self._get_with_retry(
+                session, self.base_url, lambda r: r.read(), params=params, timeout=15
+            )
+            
+            # 兼容 JSONP 与纯 JSON，直接解析字节，不先解码成 str
+            data = _json_loads(_strip_jsonp(raw))
+            
+            # 提取items
+            items = self.extract_items(data, page)
+            
+            # 尝试补全内容
+            if self.fetch_full_content and items:
+                await self.enrich_items_with_full_content(session, items)
+            
+            return items
+            
         except Exception as e:
             logger.error(f"获取第 {page} 页数据失败: {e}")
             return []
@@ -97,8 +347,8 @@ class SinaNewsCrawl(DataSourceBase):
                             if not isinstance(raw, dict):
                                 continue
                             
-                            # 提取发布时间
-                            publish_time = self.normalize_publish_time(raw)
+                            # 原始发布时间，在 get_data 中整列解析
+                            publish_time = self.pick_raw_publish_time(raw)
                             
                             # 本地可用的简介
                             intro_local = self.choose_best_intro_local(raw)
@@ -109,7 +359,7 @@ class SinaNewsCrawl(DataSourceBase):
                             processed_items.append({
                                 "title": raw.get("title") or raw.get("stitle") or "",
                                 "content": intro_local or "",
-                                "pub_time": publish_time or "",
+                                "pub_time": publish_time,
                                 "url": url or "",
                             })
                         return processed_items
@@ -118,39 +368,30 @@ class SinaNewsCrawl(DataSourceBase):
             logger.error(f"解析第 {page} 页数据失败: {e}")
             return []
     
+    def pick_raw_publish_time(self, raw_item: dict) -> Any:
+        """选取第一个非空的候选时间字段（见 _TIME_KEYS），返回原始值（没有时返回 None）"""
+        return next((v for v in map(raw_item.get, _TIME_KEYS) if v not in (None, "")), None)
+    
     def normalize_publish_time(self, raw_item: dict) -> str:
-        """将多种时间格式标准化为 'YYYY-MM-DD HH:MM:SS' 字符串"""
+        """
+        将多种时间格式标准化为 'YYYY-MM-DD HH:MM:SS' 字符串（单条处理）
+        
+        get_data 使用整列解析的 _parse_publish_times，这里保留给单条调用。
+        """
         try:
-            # 候选时间字段
-            candidate_keys = [
-                "ctime", "intime", "mtime", "create_time", "createtime",
-                "pub_time", "pubTime", "pubdate", "pubDate", "time", "update_time"
-            ]
-            raw_time_value = None
-            for key in candidate_keys:
-                if key in raw_item and raw_item.get(key) not in (None, ""):
-                    raw_time_value = raw_item.get(key)
-                    break
-            
+            raw_time_value = self.pick_raw_publish_time(raw_item)
             if raw_time_value is None:
                 return ""
             
             # 数字时间戳（秒或毫秒）
             if isinstance(raw_time_value, (int, float)):
                 timestamp = int(raw_time_value)
-            elif isinstance(raw_time_value, str) and re.fullmatch(r"\d{10,13}", raw_time_value):
+            elif isinstance(raw_time_value, str) and _TS_RE.fullmatch(raw_time_value):
                 timestamp = int(raw_time_value)
             else:
                 # 尝试解析常见的时间字符串
                 if isinstance(raw_time_value, str):
-                    for fmt in [
-                        "%Y-%m-%d %H:%M:%S",
-                        "%Y-%m-%d %H:%M",
-                        "%Y-%m-%d",
-                        "%Y/%m/%d %H:%M:%S",
-                        "%Y/%m/%d %H:%M",
-                        "%Y/%m/%d",
-                    ]:
+                    for fmt in _DATE_FMTS:
                         try:
                             dt = datetime.strptime(raw_time_value.strip(), fmt)
                             return dt.strftime("%Y-%m-%d %H:%M:%S")
@@ -212,47 +453,106 @@ class SinaNewsCrawl(DataSourceBase):
         text = content_text.strip()
         if len(text) < 60:
             return True
-        if text.endswith("…") or text.endswith("..."):
+        if text.endswith(("…", "...")):
             return True
         return False
     
     async def enrich_items_with_full_content(self, session: aiohttp.ClientSession, items: List[Dict[str, Any]]):
-        """并发抓取文章页，补全内容"""
-        semaphore = asyncio.Semaphore(self.article_concurrency)
+        """并发抓取文章页，补全内容（固定数量的 worker 消费队列，并发数即 worker 数）"""
+        # 先筛出确实需要抓取的条目，简介已足够或没有链接的不进入队列
+        targets = [
+            it for it in items
+            if it.get("url") and self.should_fetch_full_content(it.get("content", ""))
+        ]
+        if not targets:
+            return
+        
+        queue: asyncio.Queue = asyncio.Queue()
+        for it in targets:
+            queue.put_nowait(it)
         
         async def process_one(item: Dict[str, Any]):
-            if not self.should_fetch_full_content(item.get("content", "")):
-                return
-            url = item.get("url")
-            if not url:
-                return
             try:
-                async with semaphore:
-                    content_full = await self.fetch_article_content(session, url)
+                content_full = await self.fetch_article_content(session, item["url"])
                 if content_full and len(content_full) > len(item.get("content") or ""):
                     item["content"] = content_full
             except Exception:
                 pass
         
-        await asyncio.gather(*[process_one(it) for it in items])
+        async def worker():
+            while True:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await process_one(item)
+        
+        worker_count = min(self.article_concurrency, len(targets))
+        await asyncio.gather(*[worker() for _ in range(worker_count)])
     
     async def fetch_article_content(self, session: aiohttp.ClientSession, url: str) -> str:
-        """抓取文章页内容：优先 meta description，其次正文首段"""
+        """
+        抓取文章页内容：优先 meta description，其次正文首段
+        
+        use_cache 为 True 时，成功提取的内容按 URL 在进程内缓存 ARTICLE_CACHE_TTL 秒，
+        各实例共享，重叠的查询不再重复请求同一篇文章。
+        """
+        if self.use_cache:
+            cached = self._article_cache.get(url)
+            if cached is not None and time.monotonic() - cached[0] < self.ARTICLE_CACHE_TTL:
+                return cached[1]
+        
         try:
-            async with session.get(url, headers=self.headers, timeout=15) as resp:
-                html_text = await resp.text(errors="ignore")
+            html_text = await self._get_with_retry(
+                session, url, lambda r: r.text(errors="ignore"),
+                max_retries=self.ARTICLE_MAX_RETRIES, timeout=15
+            )
             if not html_text:
                 return ""
-            
-            # 先尝试 meta description
-            meta_desc = self._extract_meta_description(html_text)
-            if meta_desc:
-                return meta_desc
-            
-            # 退化到正文首段
-            first_paragraph = self._extract_first_paragraph(html_text)
-            if first_paragraph:
-                return first_paragraph
+            content = self._extract_article_content(html_text)
+        except Exception:
+            return ""
+        
+        if self.use_cache and content:
+            cache = self._article_cache
+            cache.pop(url, None)
+            if len(cache) >= self.ARTICLE_CACHE_MAXSIZE:
+                # dict 保持插入顺序，淘汰最早写入的一条
+                cache.pop(next(iter(cache)), None)
+            cache[url] = (time.monotonic(), content)
+        return content
+    
+    def _extract_article_content(self, html_text: str) -> str:
+        """从文章页 HTML 中提取内容：优先 meta description，其次正文首段"""
+        if HAS_SELECTOLAX:
+            return self._extract_with_selectolax(html_text)
+        
+        # 先尝试 meta description
+        meta_desc = self._extract_meta_description(html_text)
+        if meta_desc:
+            return meta_desc
+        
+        # 退化到正文首段
+        first_paragraph = self._extract_first_paragraph(html_text)
+        if first_paragraph:
+            return first_paragraph
+        return ""
+    
+    def _extract_with_selectolax(self, html_text: str) -> str:
+        """用 selectolax 一次解析 HTML：优先 meta description，其次正文首段"""
+        try:
+            tree = HTMLParser(html_text)
+            for selector in _META_DESC_SELECTORS:
+                node = tree.css_first(selector)
+                content = node.attributes.get("content") if node is not None else None
+                if content:
+                    meta_desc = self._clean_whitespace(content)
+                    if meta_desc:
+                        return meta_desc
+            for selector in _PARAGRAPH_SELECTORS:
+                node = tree.css_first(selector)
+                if node is not None:
+                    return self._clean_whitespace(node.text(separator=" "))
             return ""
         except Exception:
             return ""
@@ -261,11 +561,11 @@ class SinaNewsCrawl(DataSourceBase):
         """从HTML中提取<meta name="description">或<meta property="og:description">"""
         try:
             # name=description
-            m1 = re.search(r'<meta[^>]+name=["\']description["\'][^>]+content=["\'](.*?)["\']', html_text, re.I | re.S)
+            m1 = _META_DESC_RE.search(html_text)
             if m1:
                 return html.unescape(self._clean_whitespace(m1.group(1)))
             # property=og:description
-            m2 = re.search(r'<meta[^>]+property=["\']og:description["\'][^>]+content=["\'](.*?)["\']', html_text, re.I | re.S)
+            m2 = _META_OG_DESC_RE.search(html_text)
             if m2:
                 return html.unescape(self._clean_whitespace(m2.group(1)))
             return ""
@@ -275,22 +575,17 @@ class SinaNewsCrawl(DataSourceBase):
     def _extract_first_paragraph(self, html_text: str) -> str:
         """从常见容器中提取首段文本"""
         try:
-            container_patterns = [
-                r'<div[^>]+id=["\']artibody["\'][^>]*>(.*?)</div>',
-                r'<article[^>]*>(.*?)</article>',
-                r'<div[^>]+class=["\'][^"\']*(?:article|content)[^"\']*["\'][^>]*>(.*?)</div>',
-            ]
-            for pat in container_patterns:
-                m = re.search(pat, html_text, re.I | re.S)
+            for pattern in _CONTAINER_RES:
+                m = pattern.search(html_text)
                 if m:
                     inner = m.group(1)
                     # 找第一个<p>
-                    p = re.search(r'<p[^>]*>(.*?)</p>', inner, re.I | re.S)
+                    p = _PARAGRAPH_RE.search(inner)
                     if p:
                         text = self._strip_html_tags(p.group(1))
                         return self._clean_whitespace(text)
             # 兜底：全局第一个<p>
-            p = re.search(r'<p[^>]*>(.*?)</p>', html_text, re.I | re.S)
+            p = _PARAGRAPH_RE.search(html_text)
             if p:
                 text = self._strip_html_tags(p.group(1))
                 return self._clean_whitespace(text)
@@ -300,35 +595,53 @@ class SinaNewsCrawl(DataSourceBase):
     
     def _strip_html_tags(self, text: str) -> str:
         """去除HTML标签"""
-        text = re.sub(r'<script[\s\S]*?</script>', ' ', text, flags=re.I)
-        text = re.sub(r'<style[\s\S]*?</style>', ' ', text, flags=re.I)
-        text = re.sub(r'<[^>]+>', ' ', text)
+        # script 与 style 合并为一个模式，只扫描一遍
+        text = _SCRIPT_STYLE_RE.sub(' ', text)
+        text = _TAG_RE.sub(' ', text)
         return html.unescape(text)
     
     def _clean_whitespace(self, text: str) -> str:
         """清理空白字符"""
-        return re.sub(r'\s+', ' ', (text or '')).strip()
-    
-    async def crawl_all_pages(self) -> List[Dict[str, Any]]:
-        """爬取所有页面"""
-        all_items = []
-        
-        timeout = aiohttp.ClientTimeout(total=30)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            tasks = []
-            for page in range(self.start_page, self.end_page + 1):
-                task = self.fetch_page(session, page)
-                tasks.append(task)
-            
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            for page, result in enumerate(results, start=self.start_page):
-                if isinstance(result, Exception):
-                    logger.error(f"第 {page} 页发生异常: {result}")
-                elif isinstance(result, list):
-                    all_items.extend(result)
+        return _WS_RE.sub(' ', (text or '')).strip()
+    
+    async def crawl_all_pages(self) -> Dict[str, List[Any]]:
+        """
+        爬取所有页面
+        
+        Returns:
+            按列组织的数据：REQUIRED_COLUMNS 中每列对应一个列表，各列表等长、按行对齐，
+            可直接构造 DataFrame，无需再逐个字典推断列
+        """
+        session = await self._get_session()
+        
+        async def fetch_numbered(page: int):
+            try:
+                return page, await self.fetch_page(session, page)
+            except Exception as e:
+                return page, e
         
-        return all_items
+        # 按完成顺序处理：每页完成后立即拆成列并释放逐行字典，最后再按页码顺序拼接
+        page_columns: Dict[int, Dict[str, List[Any]]] = {}
+        tasks = [
+            asyncio.create_task(fetch_numbered(page))
+            for page in range(self.start_page, self.end_page + 1)
+        ]
+        for next_done in asyncio.as_completed(tasks):
+            page, result = await next_done
+            if isinstance(result, Exception):
+                logger.error(f"第 {page} 页发生异常: {result}")
+            elif isinstance(result, list):
+                page_columns[page] = {
+                    col: [item[col] for item in result] for col in self.REQUIRED_COLUMNS
+                }
+                logger.debug(f"第 {page} 页完成，{len(result)} 条")
+        
+        columns: Dict[str, List[Any]] = {col: [] for col in self.REQUIRED_COLUMNS}
+        for page in sorted(page_columns):
+            for col, values in page_columns.pop(page).items():
+                columns[col].extend(values)
+        
+        return columns
     
     async def get_data(self, trigger_time: str, **query_params) -> pd.DataFrame:
         """
@@ -341,31 +654,39 @@ class SinaNewsCrawl(DataSourceBase):
             DataFrame with columns ['title', 'content', 'pub_time', 'url']
         """
         try:
-            items = await self.crawl_all_pages()
+            columns = await self.crawl_all_pages()
         except Exception as e:
             logger.error(f"爬取数据失败: {e}")
             return pd.DataFrame(columns=self.REQUIRED_COLUMNS)
         
-        if not items:
+        total = len(columns['url'])
+        if not total:
             logger.warning("未收集到任何数据")
             return pd.DataFrame(columns=self.REQUIRED_COLUMNS)
         
-        logger.info(f"处理 {len(items)} 条收集到的数据...")
+        logger.info(f"处理 {total} 条收集到的数据...")
         
-        df = pd.DataFrame(items)
+        df = pd.DataFrame(columns, copy=False)
         
-        # 处理时间字段并筛选
+        # 处理时间字段并筛选：解析结果只作局部列使用，筛选后一次性取行并写回格式化后的时间
         if not df.empty and 'pub_time' in df.columns:
-            df['pub_time'] = pd.to_datetime(df['pub_time'], errors='coerce')
+            pub_dt = _parse_publish_times(df['pub_time'])
             end_dt = pd.to_datetime(trigger_time, errors='coerce')
-            mask = pd.Series(True, index=df.index)
             if not pd.isna(end_dt):
-                # 筛选最近一天的数据
+                # 筛选最近一天的数据：按时间排序后二分定位 [start_dt, end_dt)，
+                # 再按原始位置取行，保持接口返回的顺序（NaT 排在末尾，不会落入区间）
                 start_dt = end_dt - pd.Timedelta(days=1)
-                mask &= (df['pub_time'] >= start_dt) & (df['pub_time'] < end_dt)
-            df = df.loc[mask].reset_index(drop=True)
-            if 'pub_time' in df.columns:
-                df['pub_time'] = df['pub_time'].dt.strftime("%Y-%m-%d %H:%M:%S")
+                pub_times = pub_dt.to_numpy()
+                order = np.argsort(pub_times, kind='stable')
+                lo, hi = np.searchsorted(
+                    pub_times[order],
+                    [start_dt.to_datetime64(), end_dt.to_datetime64()]
+                )
+                keep = np.sort(order[lo:hi])
+                df = df.iloc[keep]
+                pub_dt = pub_dt.iloc[keep]
+            df = df.reset_index(drop=True)
+            df['pub_time'] = pub_dt.dt.strftime("%Y-%m-%d %H:%M:%S").to_numpy()
         
         # 确保所有必需列都存在
         for col in self.REQUIRED_COLUMNS:
@@ -379,7 +700,14 @@ class SinaNewsCrawl(DataSourceBase):
 if __name__ == "__main__":
     # 测试代码
     crawler = SinaNewsCrawl(start_page=1, end_page=2)
-    df = asyncio.run(crawler.fetch_data_async("2025-01-20 15:00:00"))
+    
+    async def _main():
+        try:
+            return await crawler.fetch_data_async("2025-01-20 15:00:00")
+        finally:
+            await crawler.aclose()
+    
+    df = asyncio.run(_main())
     print(f"获取到 {len(df)} 条记录")
     if not df.empty:
         print(df.head())
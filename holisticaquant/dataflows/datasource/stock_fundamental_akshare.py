@@ -8,8 +8,11 @@
 """
 import pandas as pd
 import asyncio
+import threading
+import time
 from datetime import datetime
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Tuple
 from loguru import logger
 
 from .data_source_base import DataSourceBase
@@ -17,6 +20,45 @@ from ..utils.akshare_utils import akshare_cached, HAS_AKSHARE
 from ..utils.date_utils import get_previous_trading_date
 
 
+# 带市场前缀的代码（标准化后为小写）
+_MARKET_PREFIXES = ('sh', 'sz', 'bj')
+
+
+@lru_cache(maxsize=1024)
+def _normalize_ticker(ticker: str) -> str:
+    """
+    标准化股票代码（结果按输入缓存，智能体会反复查询同一批股票）
+    
+    Args:
+        ticker: 股票代码，可能是 "000001", "000001.SZ", "sh000001" 等
+        
+    Returns:
+        标准化的股票代码（用于 akshare）
+    """
+    ticker = ticker.upper().strip()
+    # 移除 .SH, .SZ 等后缀
+    if '.' in ticker:
+        ticker = ticker.split('.')[0]
+    
+    # 如果已经有市场前缀（SH/SZ/BJ），先提取纯数字部分
+    if ticker.startswith(('SH', 'SZ', 'BJ')):
+        ticker_digits = ticker[2:]  # 移除前缀
+        if ticker_digits.isdigit() and len(ticker_digits) == 6:
+            # 返回小写前缀格式（akshare使用小写）
+            return f"{ticker[:2].lower()}{ticker_digits}"
+    
+    # 如果是 6 位数字，添加市场前缀
+    if ticker.isdigit() and len(ticker) == 6:
+        if ticker.startswith(('00', '30')):  # 深市
+            return f"sz{ticker}"
+        elif ticker.startswith(('60', '68')):  # 沪市
+            return f"sh{ticker}"
+        elif ticker.startswith(('43', '83', '87')):  # 北交所
+            return f"bj{ticker}"
+    
+    return ticker.lower() if ticker else ticker
+
+
 class StockFundamentalAkshare(DataSourceBase):
     """
     股票基本面数据源（基于 akshare，主动查询工具）
@@ -27,6 +69,12 @@ class StockFundamentalAkshare(DataSourceBase):
     - 业绩数据（营收、利润等）
     """
     
+    # 全市场实时行情快照缓存（use_cache=True 时启用，进程内、跨实例共享）：(获取时间, 以代码为索引的 DataFrame 或 None)
+    # 获取失败时记为 None，在 TTL 内直接走历史行情回退，不再反复请求
+    SPOT_CACHE_TTL = 60
+    _spot_cache: Optional[Tuple[float, Optional[pd.DataFrame]]] = None
+    _spot_lock = threading.Lock()
+    
     def __init__(self,
                  max_size_kb: Optional[float] = 512.0,
                  max_time_range_days: Optional[int] = 7,
@@ -53,33 +101,52 @@ class StockFundamentalAkshare(DataSourceBase):
         Returns:
             标准化的股票代码（用于 akshare）
         """
-        ticker = ticker.upper().strip()
-        # 移除 .SH, .SZ 等后缀
-        if '.' in ticker:
-            ticker = ticker.split('.')[0]
+        return _normalize_ticker(ticker)
+    
+    def _load_spot_snapshot(self) -> Optional[pd.DataFrame]:
+        """
+        获取全市场 A 股实时行情快照（以 '代码' 为索引）
         
-        # 如果已经有市场前缀（SH/SZ/BJ），先提取纯数字部分
-        if ticker.startswith(('SH', 'SZ', 'BJ')):
-            ticker_digits = ticker[2:]  # 移除前缀
-            if ticker_digits.isdigit() and len(ticker_digits) == 6:
-                # 返回小写前缀格式（akshare使用小写）
-                return f"{ticker[:2].lower()}{ticker_digits}"
+        stock_zh_a_spot_em 一次请求返回全部 A 股；use_cache=True 时结果按 SPOT_CACHE_TTL 缓存，
+        多个股票的查询只需一次请求，之后按代码索引查找。use_cache=False 时每次都重新获取，
+        既不读取也不写入缓存。
         
-        # 如果是 6 位数字，添加市场前缀
-        if ticker.isdigit() and len(ticker) == 6:
-            if ticker.startswith(('00', '30')):  # 深市
-                return f"sz{ticker}"
-            elif ticker.startswith(('60', '68')):  # 沪市
-                return f"sh{ticker}"
-            elif ticker.startswith(('43', '83', '87')):  # 北交所
-                return f"bj{ticker}"
+        Returns:
+            以 '代码' 为索引的 DataFrame；获取失败时返回 None
+        """
+        if not self.use_cache:
+            return self._fetch_spot_snapshot()
         
-        return ticker.lower() if ticker else ticker
+        with self._spot_lock:
+            cached = StockFundamentalAkshare._spot_cache
+            if cached is not None and time.monotonic() - cached[0] < self.SPOT_CACHE_TTL:
+                return cached[1]
+            
+            snapshot = self._fetch_spot_snapshot()
+            StockFundamentalAkshare._spot_cache = (time.monotonic(), snapshot)
+            return snapshot
+    
+    def _fetch_spot_snapshot(self) -> Optional[pd.DataFrame]:
+        """请求 stock_zh_a_spot_em 并以 '代码' 为索引，获取失败或结果为空时返回 None"""
+        try:
+            df = self._run_akshare(
+                func_name="stock_zh_a_spot_em",
+                func_kwargs={},
+                verbose=False
+            )
+            if not df.empty and '代码' in df.columns:
+                return df.set_index('代码', drop=False)
+        except Exception as e:
+            logger.debug(f"获取实时行情快照失败（stock_zh_a_spot_em）: {e}")
+        return None
     
     def get_stock_info(self, ticker: str) -> pd.DataFrame:
         """
         获取股票基本信息
         
+        优先从缓存的全市场实时行情快照中按代码查找（含名称、市盈率、市净率、市值等），
+        快照不可用或找不到该股票时，再回退到历史行情 / 分钟行情。
+        
         Args:
             ticker: 股票代码（标准化后）
             
@@ -91,48 +158,15 @@ class StockFundamentalAkshare(DataSourceBase):
                 return pd.DataFrame()
             
             # 提取股票代码（移除市场前缀）
-            ticker_code = ticker.replace('sh', '').replace('sz', '').replace('bj', '')
+            ticker_code = ticker[2:] if ticker[:2] in _MARKET_PREFIXES else ticker
             
-            # 方法1：尝试使用实时行情数据（已禁用，因为经常失败）
-            # try:
-            #     df = self._run_akshare(
-            #         func_name="stock_zh_a_spot_em",
-            #         func_kwargs={},
-            #         verbose=False
-            #     )
-            #     
-            #     if not df.empty and '代码' in df.columns:
-            #         # 查找指定股票
-            #         stock_df = df[df['代码'] == ticker_code]
-            #         if not stock_df.empty:
-            #             return stock_df
-            # except Exception as e:
-            #     logger.debug(f"方法1失败（stock_zh_a_spot_em）: {e}")
-            
-            # 方法2：尝试使用另一个实时行情函数（已禁用，因为经常失败）
-            # try:
-            #     df = self._run_akshare(
-            #         func_name="stock_zh_a_spot",
-            #         func_kwargs={},
-            #         verbose=False
-            #     )
-            #     
-            #     if not df.empty:
-            #         # stock_zh_a_spot 返回的格式可能不同，需要查找股票
-            #         # 检查可能的列名
-            #         code_col = None
-            #         for col in ['代码', 'code', 'symbol', '股票代码']:
-            #             if col in df.columns:
-            #                 code_col = col
-            #                 break
-            #         
-            #         if code_col:
-            #             # 查找指定股票
-            #             stock_df = df[df[code_col] == ticker_code]
-            #             if not stock_df.empty:
-            #                 return stock_df
-            # except Exception as e:
-            #     logger.debug(f"方法2失败（stock_zh_a_spot）: {e}")
+            # 方法1：从实时行情快照中按代码查找
+            snapshot = self._load_spot_snapshot()
+            if snapshot is not None:
+                try:
+                    return snapshot.loc[[ticker_code]].reset_index(drop=True)
+                except KeyError:
+                    logger.debug(f"实时行情快照中未找到 {ticker_code}，回退到历史行情")
             
             # 方法3：尝试使用历史数据获取基本信息（更稳定）
             try:
@@ -282,56 +316,68 @@ class StockFundamentalAkshare(DataSourceBase):
             all_records = []
             
             # 1. 基本信息（从实时行情获取）
-            stock_info_df = self.get_stock_info(ticker_normalized)
+            # akshare 为同步阻塞调用，放到线程中执行，避免阻塞事件循环
+            stock_info_df = await asyncio.to_thread(self.get_stock_info, ticker_normalized)
             
             if not stock_info_df.empty:
                 try:
                     row = stock_info_df.iloc[0].to_dict()
+                    # 代码与名称在标题、正文、URL 中多次使用，只取一次
+                    code = row.get('代码', ticker_normalized)
+                    name = row.get('名称', 'N/A')
+                    title_name = row.get('名称', ticker_normalized)
                     
                     # 格式化基本信息为结构化文本
-                    info_content = f"股票代码: {row.get('代码', ticker_normalized)}\n"
-                    info_content += f"股票名称: {row.get('名称', 'N/A')}\n"
-                    info_content += f"查询时间: {trigger_time}\n"
-                    info_content += f"交易日期: {trade_date}\n\n"
-                    info_content += "基本信息:\n"
-                    info_content += f"最新价: {row.get('最新价', 'N/A')}\n"
-                    info_content += f"涨跌额: {row.get('涨跌额', 'N/A')}\n"
-                    info_content += f"涨跌幅: {row.get('涨跌幅', 'N/A')}%\n"
-                    info_content += f"今开: {row.get('今开', 'N/A')}\n"
-                    info_content += f"最高: {row.get('最高', 'N/A')}\n"
-                    info_content += f"最低: {row.get('最低', 'N/A')}\n"
-                    info_content += f"昨收: {row.get('昨收', 'N/A')}\n"
-                    info_content += f"成交量: {row.get('成交量', 'N/A')}\n"
-                    info_content += f"成交额: {row.get('成交额', 'N/A')}\n"
+                    info_content = (
+                        f"股票代码: {code}\n"
+                        f"股票名称: {name}\n"
+                        f"查询时间: {trigger_time}\n"
+                        f"交易日期: {trade_date}\n\n"
+                        "基本信息:\n"
+                        f"最新价: {row.get('最新价', 'N/A')}\n"
+                        f"涨跌额: {row.get('涨跌额', 'N/A')}\n"
+                        f"涨跌幅: {row.get('涨跌幅', 'N/A')}%\n"
+                        f"今开: {row.get('今开', 'N/A')}\n"
+                        f"最高: {row.get('最高', 'N/A')}\n"
+                        f"最低: {row.get('最低', 'N/A')}\n"
+                        f"昨收: {row.get('昨收', 'N/A')}\n"
+                        f"成交量: {row.get('成交量', 'N/A')}\n"
+                        f"成交额: {row.get('成交额', 'N/A')}\n"
+                    )
                     
                     all_records.append({
-                        "title": f"{row.get('名称', ticker_normalized)}({row.get('代码', ticker_normalized)}) 基本信息",
+                        "title": f"{title_name}({code}) 基本信息",
                         "content": info_content,
                         "pub_time": trigger_time,
-                        "url": f"akshare://stock/info/{row.get('代码', ticker_normalized)}/{trade_date}"
+                        "url": f"akshare://stock/info/{code}/{trade_date}"
                     })
                     
                     # 2. 财务指标（从实时行情数据中提取）
                     try:
                         financial_indicators = self.get_financial_indicators(ticker_normalized, trade_date, stock_info_df)
-                        if financial_indicators:
-                            finance_content = f"股票代码: {row.get('代码', ticker_normalized)}\n"
-                            finance_content += f"股票名称: {row.get('名称', 'N/A')}\n"
-                            finance_content += f"交易日期: {trade_date}\n"
-                            finance_content += f"查询时间: {trigger_time}\n\n"
-                            finance_content += "财务指标:\n"
-                            finance_content += f"市盈率(PE): {financial_indicators.get('pe_ratio', 'N/A')}\n"
-                            finance_content += f"市净率(PB): {financial_indicators.get('pb_ratio', 'N/A')}\n"
-                            finance_content += f"总市值: {financial_indicators.get('total_mv', 'N/A')}\n"
-                            finance_content += f"流通市值: {financial_indicators.get('flow_mv', 'N/A')}\n"
-                            finance_content += f"换手率: {financial_indicators.get('turnover_rate', 'N/A')}%\n"
-                            finance_content += f"量比: {financial_indicators.get('volume_ratio', 'N/A')}\n"
+                        # 历史行情回退路径中没有估值字段，全为 N/A 的记录只是噪声，直接跳过
+                        if financial_indicators and not all(
+                            v == 'N/A' for v in financial_indicators.values()
+                        ):
+                            finance_content = (
+                                f"股票代码: {code}\n"
+                                f"股票名称: {name}\n"
+                                f"交易日期: {trade_date}\n"
+                                f"查询时间: {trigger_time}\n\n"
+                                "财务指标:\n"
+                                f"市盈率(PE): {financial_indicators.get('pe_ratio', 'N/A')}\n"
+                                f"市净率(PB): {financial_indicators.get('pb_ratio', 'N/A')}\n"
+                                f"总市值: {financial_indicators.get('total_mv', 'N/A')}\n"
+                                f"流通市值: {financial_indicators.get('flow_mv', 'N/A')}\n"
+                                f"换手率: {financial_indicators.get('turnover_rate', 'N/A')}%\n"
+                                f"量比: {financial_indicators.get('volume_ratio', 'N/A')}\n"
+                            )
                             
                             all_records.append({
-                                "title": f"{row.get('名称', ticker_normalized)}({row.get('代码', ticker_normalized)}) 财务指标",
+                                "title": f"{title_name}({code}) 财务指标",
                                 "content": finance_content,
                                 "pub_time": trigger_time,
-                                "url": f"akshare://stock/financial/{row.get('代码', ticker_normalized)}/{trade_date}"
+                                "url": f"akshare://stock/financial/{code}/{trade_date}"
                             })
                     except Exception as e:
                         logger.warning(f"提取财务指标失败: {e}")
@@ -7,10 +7,18 @@
 - 历史价格数据
 - 成交量、成交额等
 """
+from __future__ import annotations
+
 import pandas as pd
+from pandas.api.types import is_numeric_dtype
 import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
-from typing import Optional
+from functools import lru_cache, partial
+from typing import Any, Dict, List, Optional, Tuple
 from loguru import logger
 
 from .data_source_base import DataSourceBase
@@ -18,6 +26,155 @@ from ..utils.akshare_utils import akshare_cached, HAS_AKSHARE
 from ..utils.date_utils import get_previous_trading_date
 
 
+# 带市场前缀的代码（标准化后为小写）
+_MARKET_PREFIXES = ('sh', 'sz', 'bj')
+
+# 6 位代码前两位 -> 市场前缀（深市 00/30，沪市 60/68，北交所 43/83/87）
+_MARKET_BY_PREFIX2 = {
+    '00': 'sz', '30': 'sz',
+    '60': 'sh', '68': 'sh',
+    '43': 'bj', '83': 'bj', '87': 'bj',
+}
+
+
+# 缺失字段的展示值
+_NA = 'N/A'
+
+# akshare 日线/分钟线的中文列名（模块级常量，各处统一引用）
+_COL_DATE = '日期'
+_COL_OPEN = '开盘'
+_COL_CLOSE = '收盘'
+_COL_HIGH = '最高'
+_COL_LOW = '最低'
+_COL_VOLUME = '成交量'
+_COL_AMOUNT = '成交额'
+
+# 行情计算用到的日线/分钟线列，以及 get_data 中逐行展示的K线列（按展示顺序）
+_QUOTE_FIELDS = (_COL_OPEN, _COL_CLOSE, _COL_HIGH, _COL_LOW, _COL_VOLUME, _COL_AMOUNT)
+_KLINE_FIELDS = (_COL_DATE,) + _QUOTE_FIELDS
+
+
+@dataclass(frozen=True, slots=True)
+class Quote:
+    """
+    实时行情
+    
+    数据源中没有的字段为 'N/A'（涨跌额 / 涨跌幅无法计算时为 0）。
+    不可变，可直接放入缓存在多个调用方之间共享。
+    """
+    code: str
+    name: str
+    latest_price: Any = _NA
+    change_amount: Any = 0
+    change_rate: Any = 0
+    volume: Any = _NA
+    turnover: Any = _NA
+    high: Any = _NA
+    low: Any = _NA
+    open: Any = _NA
+    pre_close: Any = _NA
+    turnover_rate: Any = _NA
+    pe_ratio: Any = _NA
+    total_mv: Any = _NA
+    flow_mv: Any = _NA
+    
+    def to_dict(self) -> dict:
+        """转换为字典（键与字段名相同）"""
+        return asdict(self)
+
+
+def _row_values(df: pd.DataFrame, columns: Tuple[str, ...], pos: int = -1) -> dict:
+    """按列用 iat 取第 pos 行的标量值（不构造整行 Series），df 中没有的列不出现在结果中"""
+    return {col: df[col].iat[pos] for col in columns if col in df.columns}
+
+
+def _close_change(df: pd.DataFrame) -> Tuple[Any, Any]:
+    """
+    最近两根K线收盘价的涨跌额与涨跌幅（%）
+    
+    收盘价列为数值类型时直接按列取最后两个值计算（整数列同样适用）；
+    不足两根、缺少收盘价列或该列不是数值类型时均返回 0。
+    """
+    if len(df) < 2 or _COL_CLOSE not in df.columns or not is_numeric_dtype(df[_COL_CLOSE]):
+        return 0, 0
+    closes = df[_COL_CLOSE]
+    prev_close = closes.iat[-2]
+    change_amount = closes.iat[-1] - prev_close
+    change_rate = (change_amount / prev_close * 100) if prev_close != 0 else 0
+    return change_amount, change_rate
+
+
+def _quote_from_bars(ticker_code: str, df: pd.DataFrame, with_volume: bool = True) -> Quote:
+    """
+    以最近一根K线作为"实时"行情
+    
+    Args:
+        ticker_code: 不带市场前缀的股票代码（K线数据中没有名称，名称也用代码）
+        df: 日线或分钟K线（非空）
+        with_volume: 是否采用K线中的成交量/成交额（分钟K线不采用）
+        
+    Returns:
+        Quote（换手率、市盈率、市值等K线中没有的字段为 'N/A'）
+    """
+    latest = _row_values(df, _QUOTE_FIELDS)
+    change_amount, change_rate = _close_change(df)
+    if len(df) > 1:
+        pre_close = df[_COL_CLOSE].iat[-2] if _COL_CLOSE in df.columns else 0
+    else:
+        pre_close = latest.get(_COL_CLOSE, _NA)
+    return Quote(
+        code=ticker_code,
+        name=ticker_code,
+        latest_price=latest.get(_COL_CLOSE, _NA),
+        change_amount=change_amount,
+        change_rate=change_rate,
+        volume=latest.get(_COL_VOLUME, _NA) if with_volume else _NA,
+        turnover=latest.get(_COL_AMOUNT, _NA) if with_volume else _NA,
+        high=latest.get(_COL_HIGH, _NA),
+        low=latest.get(_COL_LOW, _NA),
+        open=latest.get(_COL_OPEN, _NA),
+        pre_close=pre_close,
+    )
+
+
+def _strip_market_prefix(ticker: str) -> str:
+    """去掉标准化代码开头的市场前缀（sh/sz/bj），得到 stock_zh_a_hist 等接口使用的纯代码"""
+    return ticker[2:] if ticker[:2] in _MARKET_PREFIXES else ticker
+
+
+@lru_cache(maxsize=4096)
+def _normalize_ticker(ticker: str) -> str:
+    """
+    标准化股票代码（纯函数，结果按输入字符串缓存）
+    
+    Args:
+        ticker: 股票代码，可能是 "000001", "000001.SZ", "sh000001" 等
+        
+    Returns:
+        标准化的股票代码（用于 akshare）
+    """
+    ticker = ticker.upper().strip()
+    # 移除 .SH, .SZ 等后缀
+    if '.' in ticker:
+        ticker = ticker.split('.')[0]
+    
+    # 如果已经有市场前缀（SH/SZ/BJ），先提取纯数字部分
+    prefix = ticker[:2].lower()
+    if prefix in _MARKET_PREFIXES:
+        ticker_digits = ticker[2:]  # 移除前缀
+        if ticker_digits.isdigit() and len(ticker_digits) == 6:
+            # 返回小写前缀格式（akshare使用小写）
+            return f"{prefix}{ticker_digits}"
+    
+    # 如果是 6 位数字，按前两位添加市场前缀
+    if ticker.isdigit() and len(ticker) == 6:
+        market = _MARKET_BY_PREFIX2.get(ticker[:2])
+        if market:
+            return f"{market}{ticker}"
+    
+    return ticker.lower() if ticker else ticker
+
+
 class StockMarketDataAkshare(DataSourceBase):
     """
     股票市场数据源（基于 akshare，主动查询工具）
@@ -29,6 +186,23 @@ class StockMarketDataAkshare(DataSourceBase):
     - 成交量、成交额
     """
     
+    # 行情 / K线的进程内 TTL 缓存（use_cache=True 时启用，类级别共享，每次新建实例仍可命中）
+    QUOTE_CACHE_TTL = 30
+    KLINE_CACHE_TTL = 300
+    _quote_cache: Dict[str, Tuple[float, Quote]] = {}
+    _kline_cache: Dict[Tuple[str, str, int], Tuple[float, pd.DataFrame]] = {}
+    _cache_lock = threading.Lock()
+    
+    # 行情只用最近两根K线，按日期范围请求，避免拉取全部历史（自然日，覆盖长假）
+    QUOTE_DAILY_LOOKBACK_DAYS = 15
+    QUOTE_MINUTE_LOOKBACK_DAYS = 5
+    
+    # get_data_many 中同时查询的股票数上限
+    BATCH_CONCURRENCY = 8
+    
+    # akshare 同步调用共用的线程池（类级别共享，线程复用，同时也限制对接口的并发请求数）
+    _pool = ThreadPoolExecutor(max_workers=BATCH_CONCURRENCY, thread_name_prefix="akshare")
+    
     def __init__(self,
                  max_size_kb: Optional[float] = 512.0,
                  max_time_range_days: Optional[int] = 30,
@@ -55,218 +229,147 @@ class StockMarketDataAkshare(DataSourceBase):
         Returns:
             标准化的股票代码（用于 akshare）
         """
-        ticker = ticker.upper().strip()
-        # 移除 .SH, .SZ 等后缀
-        if '.' in ticker:
-            ticker = ticker.split('.')[0]
-        
-        # 如果已经有市场前缀（SH/SZ/BJ），先提取纯数字部分
-        if ticker.startswith(('SH', 'SZ', 'BJ')):
-            ticker_digits = ticker[2:]  # 移除前缀
-            if ticker_digits.isdigit() and len(ticker_digits) == 6:
-                # 返回小写前缀格式（akshare使用小写）
-                return f"{ticker[:2].lower()}{ticker_digits}"
+        return _normalize_ticker(ticker)
+    
+    async def _run_blocking(self, func, *args):
+        """在共享线程池中执行同步（阻塞）调用"""
+        return await asyncio.get_running_loop().run_in_executor(self._pool, partial(func, *args))
+    
+    def _cache_get(self, cache: dict, key, ttl: float):
+        """读取类级别 TTL 缓存（use_cache=False 或未命中/已过期时返回 None）"""
+        if not self.use_cache:
+            return None
+        with self._cache_lock:
+            cached = cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < ttl:
+            return cached[1]
+        return None
+    
+    def _cache_put(self, cache: dict, key, value) -> None:
+        """写入类级别 TTL 缓存（仅 use_cache=True 时）"""
+        if self.use_cache:
+            with self._cache_lock:
+                cache[key] = (time.monotonic(), value)
+    
+    @staticmethod
+    def _kline_lookback_days(count: int, period: str = "daily") -> int:
+        """
+        取 count 根K线需要请求的自然日天数
         
-        # 如果是 6 位数字，添加市场前缀
-        if ticker.isdigit() and len(ticker) == 6:
-            if ticker.startswith(('00', '30')):  # 深市
-                return f"sz{ticker}"
-            elif ticker.startswith(('60', '68')):  # 沪市
-                return f"sh{ticker}"
-            elif ticker.startswith(('43', '83', '87')):  # 北交所
-                return f"bj{ticker}"
+        日K按交易日约占 2/3 估算并留出长假余量；周K / 月K按每根 7 / 31 天再多留一根。
+        """
+        if period == "weekly":
+            return count * 7 + 14
+        if period == "monthly":
+            return count * 31 + 31
+        return count * 2 + 10
+    
+    def _get_hist(self, ticker_code: str, lookback_days: int, period: str = "daily") -> pd.DataFrame:
+        """
+        获取最近 lookback_days 个自然日的历史K线（行情与K线共用）
         
-        return ticker.lower() if ticker else ticker
+        Args:
+            ticker_code: 不带市场前缀的股票代码（如 '000001'，stock_zh_a_hist 需要此格式）
+            lookback_days: 向前请求的自然日天数
+            period: K线周期，"daily" / "weekly" / "monthly"
+            
+        Returns:
+            K线 DataFrame（请求失败时抛出异常）
+        """
+        now = datetime.now()
+        return self._run_akshare(
+            func_name="stock_zh_a_hist",
+            func_kwargs={
+                "symbol": ticker_code,
+                "period": period,
+                "start_date": (now - timedelta(days=lookback_days)).strftime("%Y%m%d"),
+                "end_date": now.strftime("%Y%m%d"),
+                "adjust": ""
+            },
+            verbose=False
+        )
     
-    def get_realtime_quote(self, ticker: str) -> dict:
+    def get_realtime_quote(self, ticker: str, daily_df: Optional[pd.DataFrame] = None) -> Optional[Quote]:
         """
         获取实时行情数据
         
         Args:
             ticker: 股票代码（标准化后）
+            daily_df: 已获取的日线数据（见 _get_hist），传入时直接从中计算，不再请求日线；
+                为空 DataFrame 时跳过日线、直接尝试分钟数据
             
         Returns:
-            实时行情数据字典
+            Quote；获取失败时返回 None
         """
-        try:
-            if not HAS_AKSHARE:
-                return {}
-            
-            ticker_code = ticker.replace('sh', '').replace('sz', '').replace('bj', '')
-            
-            # 方法1：尝试使用实时行情数据（已禁用，因为经常失败）
-            # try:
-            #     df = self._run_akshare(
-            #         func_name="stock_zh_a_spot_em",
-            #         func_kwargs={},
-            #         verbose=False
-            #     )
-            #     
-            #     if not df.empty and '代码' in df.columns:
-            #         stock_df = df[df['代码'] == ticker_code]
-            #         if not stock_df.empty:
-            #             row = stock_df.iloc[0].to_dict()
-            #             
-            #             quote = {
-            #                 'code': row.get('代码', ticker_code),
-            #                 'name': row.get('名称', 'N/A'),
-            #                 'latest_price': row.get('最新价', 'N/A'),
-            #                 'change_amount': row.get('涨跌额', 'N/A'),
-            #                 'change_rate': row.get('涨跌幅', 'N/A'),
-            #                 'volume': row.get('成交量', 'N/A'),
-            #                 'turnover': row.get('成交额', 'N/A'),
-            #                 'high': row.get('最高', 'N/A'),
-            #                 'low': row.get('最低', 'N/A'),
-            #                 'open': row.get('今开', 'N/A'),
-            #                 'pre_close': row.get('昨收', 'N/A'),
-            #                 'turnover_rate': row.get('换手率', 'N/A'),
-            #                 'pe_ratio': row.get('市盈率', 'N/A'),
-            #                 'total_mv': row.get('总市值', 'N/A'),
-            #                 'flow_mv': row.get('流通市值', 'N/A'),
-            #             }
-            #             
-            #             return quote
-            # except Exception as e:
-            #     logger.debug(f"方法1失败（stock_zh_a_spot_em）: {e}")
-            
-            # 方法2：尝试使用另一个实时行情函数（已禁用，因为经常失败）
-            # try:
-            #     df = self._run_akshare(
-            #         func_name="stock_zh_a_spot",
-            #         func_kwargs={},
-            #         verbose=False
-            #     )
-            #     
-            #     if not df.empty:
-            #         # 查找可能的列名
-            #         code_col = None
-            #         for col in ['代码', 'code', 'symbol', '股票代码']:
-            #             if col in df.columns:
-            #                 code_col = col
-            #                 break
-            #         
-            #         if code_col:
-            #             stock_df = df[df[code_col] == ticker_code]
-            #             if not stock_df.empty:
-            #                 row = stock_df.iloc[0].to_dict()
-            #                 
-            #                 # 尝试提取字段（根据实际返回格式调整）
-            #                 quote = {
-            #                     'code': row.get(code_col, ticker_code),
-            #                     'name': row.get('名称', row.get('name', ticker_code)),
-            #                     'latest_price': row.get('最新价', row.get('price', 'N/A')),
-            #                     'change_amount': row.get('涨跌额', row.get('change', 'N/A')),
-            #                     'change_rate': row.get('涨跌幅', row.get('change_percent', 'N/A')),
-            #                     'volume': row.get('成交量', row.get('volume', 'N/A')),
-            #                     'turnover': row.get('成交额', row.get('turnover', 'N/A')),
-            #                     'high': row.get('最高', row.get('high', 'N/A')),
-            #                     'low': row.get('最低', row.get('low', 'N/A')),
-            #                     'open': row.get('今开', row.get('open', 'N/A')),
-            #                     'pre_close': row.get('昨收', row.get('pre_close', 'N/A')),
-            #                     'turnover_rate': row.get('换手率', 'N/A'),
-            #                     'pe_ratio': row.get('市盈率', 'N/A'),
-            #                     'total_mv': row.get('总市值', 'N/A'),
-            #                     'flow_mv': row.get('流通市值', 'N/A'),
-            #                 }
-            #                 
-            #                 return quote
-            # except Exception as e:
-            #     logger.debug(f"方法2失败（stock_zh_a_spot）: {e}")
+        if not HAS_AKSHARE:
+            return None
+        
+        cached = self._cache_get(self._quote_cache, ticker, self.QUOTE_CACHE_TTL)
+        if cached is not None:
+            return cached
+        
+        quote = self._fetch_realtime_quote(ticker, daily_df)
+        if quote is not None:
+            self._cache_put(self._quote_cache, ticker, quote)
+        return quote
+    
+    def _get_minute_bars(self, ticker_code: str) -> pd.DataFrame:
+        """
+        获取最近 QUOTE_MINUTE_LOOKBACK_DAYS 天的 1 分钟K线（行情的备用数据源）
+        
+        Args:
+            ticker_code: 不带市场前缀的股票代码
             
-            # 方法3：从历史数据获取最近行情（更稳定，但可能不是最新的）
-            try:
-                # 获取股票的历史数据（最近30天）
-                # 注意：stock_zh_a_hist 需要不带市场前缀的代码（如 '000001' 而不是 'sz000001'）
-                df = self._run_akshare(
-                    func_name="stock_zh_a_hist",
-                    func_kwargs={"symbol": ticker_code, "period": "daily", "adjust": ""},
-                    verbose=False
-                )
-                
-                if not df.empty:
-                    # 取最近一条数据作为"实时"行情
-                    latest = df.iloc[-1].to_dict()
-                    
-                    # 计算涨跌额和涨跌幅
-                    change_amount = 0
-                    change_rate = 0
-                    if len(df) > 1:
-                        prev_close = df.iloc[-2].get('收盘', latest.get('收盘', 0))
-                        if isinstance(latest.get('收盘', 0), (int, float)) and isinstance(prev_close, (int, float)):
-                            change_amount = latest.get('收盘', 0) - prev_close
-                            change_rate = (change_amount / prev_close * 100) if prev_close != 0 else 0
-                    
-                    quote = {
-                        'code': ticker_code,
-                        'name': ticker_code,  # 历史数据中没有名称
-                        'latest_price': latest.get('收盘', 'N/A'),
-                        'change_amount': change_amount,
-                        'change_rate': change_rate,
-                        'volume': latest.get('成交量', 'N/A'),
-                        'turnover': latest.get('成交额', 'N/A'),
-                        'high': latest.get('最高', 'N/A'),
-                        'low': latest.get('最低', 'N/A'),
-                        'open': latest.get('开盘', 'N/A'),
-                        'pre_close': prev_close if len(df) > 1 else latest.get('收盘', 'N/A'),
-                        'turnover_rate': 'N/A',  # 历史数据中没有
-                        'pe_ratio': 'N/A',  # 历史数据中没有
-                        'total_mv': 'N/A',  # 历史数据中没有
-                        'flow_mv': 'N/A',  # 历史数据中没有
-                    }
-                    
-                    return quote
-            except Exception as e:
-                logger.debug(f"方法3失败（stock_zh_a_hist）: {e}")
+        Returns:
+            分钟K线 DataFrame（请求失败时抛出异常）
+        """
+        now = datetime.now()
+        return self._run_akshare(
+            func_name="stock_zh_a_hist_min_em",
+            func_kwargs={
+                "symbol": ticker_code,
+                "period": "1",
+                "start_date": (now - timedelta(days=self.QUOTE_MINUTE_LOOKBACK_DAYS)).strftime("%Y-%m-%d %H:%M:%S"),
+                "end_date": now.strftime("%Y-%m-%d %H:%M:%S"),
+                "adjust": ""
+            },
+            verbose=False
+        )
+    
+    def _fetch_realtime_quote(self, ticker: str, daily_df: Optional[pd.DataFrame] = None) -> Optional[Quote]:
+        """
+        获取实时行情数据（不经过缓存，见 get_realtime_quote）
+        
+        按优先级依次尝试：日线（更稳定，但可能不是最新的）-> 1 分钟K线，取第一个有数据的来源。
+        stock_zh_a_spot_em / stock_zh_a_spot 全市场实时接口经常失败，不在此使用。
+        
+        Args:
+            ticker: 股票代码（标准化后）
+            daily_df: 已获取的日线数据，None 表示需要自行请求
             
-            # 方法4：尝试使用分钟数据获取最新信息（备用方案）
+        Returns:
+            Quote；获取失败时返回 None
+        """
+        ticker_code = _strip_market_prefix(ticker)
+        
+        # (接口名, 获取K线的函数, 是否采用其成交量/成交额)
+        sources = (
+            ("stock_zh_a_hist",
+             lambda: daily_df if daily_df is not None else self._get_hist(ticker_code, self.QUOTE_DAILY_LOOKBACK_DAYS),
+             True),
+            ("stock_zh_a_hist_min_em", lambda: self._get_minute_bars(ticker_code), False),
+        )
+        for func_name, fetch_bars, with_volume in sources:
             try:
-                df = self._run_akshare(
-                    func_name="stock_zh_a_hist_min_em",
-                    func_kwargs={"symbol": ticker_code, "period": "1", "adjust": ""},
-                    verbose=False
-                )
-                
+                df = fetch_bars()
                 if not df.empty:
-                    latest = df.iloc[-1].to_dict()
-                    
-                    change_amount = 0
-                    change_rate = 0
-                    if len(df) > 1:
-                        prev_close = df.iloc[-2].get('收盘', latest.get('收盘', 0))
-                        if isinstance(latest.get('收盘', 0), (int, float)) and isinstance(prev_close, (int, float)):
-                            change_amount = latest.get('收盘', 0) - prev_close
-                            change_rate = (change_amount / prev_close * 100) if prev_close != 0 else 0
-                    
-                    quote = {
-                        'code': ticker_code,
-                        'name': ticker_code,
-                        'latest_price': latest.get('收盘', 'N/A'),
-                        'change_amount': change_amount,
-                        'change_rate': change_rate,
-                        'volume': 'N/A',
-                        'turnover': 'N/A',
-                        'high': latest.get('最高', 'N/A'),
-                        'low': latest.get('最低', 'N/A'),
-                        'open': latest.get('开盘', 'N/A'),
-                        'pre_close': prev_close if len(df) > 1 else latest.get('收盘', 'N/A'),
-                        'turnover_rate': 'N/A',
-                        'pe_ratio': 'N/A',
-                        'total_mv': 'N/A',
-                        'flow_mv': 'N/A',
-                    }
-                    
-                    return quote
+                    return _quote_from_bars(ticker_code, df, with_volume)
             except Exception as e:
-                logger.debug(f"方法4失败（stock_zh_a_hist_min_em）: {e}")
-            
-            # 如果都失败，返回空字典
-            return {}
-            
-        except Exception as e:
-            logger.warning(f"获取实时行情失败 {ticker}: {e}")
-            return {}
+                logger.debug(f"获取行情失败（{func_name}）: {e}")
+        return None
     
-    def get_kline_data(self, ticker: str, period: str = "daily", count: int = 30) -> pd.DataFrame:
+    def get_kline_data(self, ticker: str, period: str = "daily", count: int = 30,
+                       daily_df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
         """
         获取K线数据
         
@@ -274,46 +377,56 @@ class StockMarketDataAkshare(DataSourceBase):
             ticker: 股票代码（标准化后）
             period: K线周期，可选 "daily"（日K）、"weekly"（周K）、"monthly"（月K）
             count: 获取的数据条数，默认 30 条
+            daily_df: 已获取的日线数据（见 _get_hist），日K时直接从中截取，不再请求
+            
+        Returns:
+            K线数据 DataFrame（只含 _KLINE_FIELDS 中存在的列）
+        """
+        if not HAS_AKSHARE:
+            return pd.DataFrame()
+        
+        key = (ticker, period, count)
+        cached = self._cache_get(self._kline_cache, key, self.KLINE_CACHE_TTL)
+        if cached is not None:
+            # 浅拷贝返回，调用方增删列不会影响缓存
+            return cached.copy(deep=False)
+        
+        df = self._fetch_kline_data(ticker, period, count, daily_df)
+        if not df.empty and self.use_cache:
+            self._cache_put(self._kline_cache, key, df)
+            return df.copy(deep=False)
+        return df
+    
+    def _fetch_kline_data(self, ticker: str, period: str, count: int,
+                          daily_df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """
+        获取K线数据（不经过缓存，见 get_kline_data）
+        
+        Args:
+            ticker: 股票代码（标准化后）
+            period: K线周期
+            count: 获取的数据条数
+            daily_df: 已获取的日线数据，None 表示需要自行请求
             
         Returns:
             K线数据 DataFrame
         """
         try:
-            if not HAS_AKSHARE:
-                return pd.DataFrame()
-            
-            # 根据周期选择不同的函数
-            period_map = {
-                "daily": "stock_zh_a_hist",
-                "weekly": "stock_zh_a_hist",
-                "monthly": "stock_zh_a_hist",
-            }
-            
-            func_name = period_map.get(period, "stock_zh_a_hist")
+            # 获取历史数据
+            # 注意：stock_zh_a_hist 需要不带市场前缀的代码
+            ticker_code = _strip_market_prefix(ticker)
+            df = daily_df if period == "daily" else None
+            if df is None:
+                # 按周期请求刚好覆盖 count 根K线的日期范围，不拉取全部历史
+                df = self._get_hist(ticker_code, self._kline_lookback_days(count, period), period)
             
-            try:
-                # 获取历史数据
-                # 注意：stock_zh_a_hist 需要不带市场前缀的代码
-                ticker_code = ticker.replace('sh', '').replace('sz', '').replace('bj', '')
-                df = self._run_akshare(
-                    func_name=func_name,
-                    func_kwargs={
-                        "symbol": ticker_code,
-                        "period": period if period != "daily" else "daily",
-                        "adjust": "",
-                    },
-                    verbose=False
-                )
-                
-                if df.empty:
-                    return pd.DataFrame()
-                
-                # 取最近 count 条
-                df = df.tail(count)
-                return df
-            except Exception as e:
-                logger.warning(f"获取K线数据失败: {e}")
+            if df.empty:
                 return pd.DataFrame()
+            
+            # 日期范围已基本对应 count 根，多出时才截取；只保留K线展示用到的列（缓存与后续格式化都只处理窄表）
+            if len(df) > count:
+                df = df.iloc[-count:]
+            return df[[col for col in _KLINE_FIELDS if col in df.columns]]
         except Exception as e:
             logger.warning(f"获取K线数据失败 {ticker}: {e}")
             return pd.DataFrame()
@@ -342,63 +455,78 @@ class StockMarketDataAkshare(DataSourceBase):
             
             all_records = []
             
-            # 1. 实时行情数据
+            # 行情与K线都来自同一份日线数据：只请求一次（覆盖30根K线的日期范围），两处共用
+            # 两者都已在缓存中时不再请求
+            daily_df = None
+            if (self._cache_get(self._quote_cache, ticker_normalized, self.QUOTE_CACHE_TTL) is None
+                    or self._cache_get(self._kline_cache, (ticker_normalized, "daily", 30), self.KLINE_CACHE_TTL) is None):
+                try:
+                    daily_df = await self._run_blocking(
+                        self._get_hist,
+                        _strip_market_prefix(ticker_normalized),
+                        self._kline_lookback_days(30)
+                    )
+                except Exception as e:
+                    logger.debug(f"获取日线数据失败（stock_zh_a_hist）: {e}")
+                    daily_df = pd.DataFrame()
+            
+            # 1. 实时行情数据（日线为空时会回退到分钟数据，仍可能请求网络，放到线程中执行）
             try:
-                quote = self.get_realtime_quote(ticker_normalized)
-                if quote and quote.get('code'):
-                    quote_content = f"股票代码: {quote.get('code', ticker_normalized)}\n"
-                    quote_content += f"股票名称: {quote.get('name', 'N/A')}\n"
-                    quote_content += f"查询时间: {trigger_time}\n"
-                    quote_content += f"交易日期: {trade_date}\n\n"
-                    quote_content += "实时行情:\n"
-                    quote_content += f"最新价: {quote.get('latest_price', 'N/A')}\n"
-                    quote_content += f"涨跌额: {quote.get('change_amount', 'N/A')}\n"
-                    quote_content += f"涨跌幅: {quote.get('change_rate', 'N/A')}%\n"
-                    quote_content += f"今开: {quote.get('open', 'N/A')}\n"
-                    quote_content += f"最高: {quote.get('high', 'N/A')}\n"
-                    quote_content += f"最低: {quote.get('low', 'N/A')}\n"
-                    quote_content += f"昨收: {quote.get('pre_close', 'N/A')}\n"
-                    quote_content += f"成交量: {quote.get('volume', 'N/A')}\n"
-                    quote_content += f"成交额: {quote.get('turnover', 'N/A')}\n"
-                    quote_content += f"换手率: {quote.get('turnover_rate', 'N/A')}%\n"
-                    quote_content += f"市盈率: {quote.get('pe_ratio', 'N/A')}\n"
-                    quote_content += f"总市值: {quote.get('total_mv', 'N/A')}\n"
-                    quote_content += f"流通市值: {quote.get('flow_mv', 'N/A')}\n"
+                quote = await self._run_blocking(self.get_realtime_quote, ticker_normalized, daily_df)
+                if quote is not None and quote.code:
+                    quote_content = (
+                        f"股票代码: {quote.code}\n"
+                        f"股票名称: {quote.name}\n"
+                        f"查询时间: {trigger_time}\n"
+                        f"交易日期: {trade_date}\n\n"
+                        "实时行情:\n"
+                        f"最新价: {quote.latest_price}\n"
+                        f"涨跌额: {quote.change_amount}\n"
+                        f"涨跌幅: {quote.change_rate}%\n"
+                        f"今开: {quote.open}\n"
+                        f"最高: {quote.high}\n"
+                        f"最低: {quote.low}\n"
+                        f"昨收: {quote.pre_close}\n"
+                        f"成交量: {quote.volume}\n"
+                        f"成交额: {quote.turnover}\n"
+                        f"换手率: {quote.turnover_rate}%\n"
+                        f"市盈率: {quote.pe_ratio}\n"
+                        f"总市值: {quote.total_mv}\n"
+                        f"流通市值: {quote.flow_mv}\n"
+                    )
                     
                     all_records.append({
-                        "title": f"{quote.get('name', ticker_normalized)}({quote.get('code', ticker_normalized)}) 实时行情",
+                        "title": f"{quote.name}({quote.code}) 实时行情",
                         "content": quote_content,
                         "pub_time": trigger_time,
-                        "url": f"akshare://stock/quote/{quote.get('code', ticker_normalized)}/{trade_date}"
+                        "url": f"akshare://stock/quote/{quote.code}/{trade_date}"
                     })
             except Exception as e:
                 logger.warning(f"获取实时行情失败: {e}")
             
             # 2. K线数据（最近30天）
             try:
-                kline_df = self.get_kline_data(ticker_normalized, period="daily", count=30)
+                kline_df = self.get_kline_data(ticker_normalized, period="daily", count=30, daily_df=daily_df)
                 if not kline_df.empty:
-                    kline_content = f"股票代码: {ticker_normalized}\n"
-                    kline_content += f"查询时间: {trigger_time}\n"
-                    kline_content += f"交易日期: {trade_date}\n\n"
-                    kline_content += f"最近30天日K线数据:\n\n"
-                    
-                    # 格式化最近5天的数据
+                    # 格式化最近5天的数据（get_kline_data 已按 _KLINE_FIELDS 顺序取列，只有缺列时才需补齐）
                     recent_kline = kline_df.tail(5)
-                    for idx, row in recent_kline.iterrows():
-                        date = row.get('日期', 'N/A')
-                        open_price = row.get('开盘', 'N/A')
-                        close_price = row.get('收盘', 'N/A')
-                        high_price = row.get('最高', 'N/A')
-                        low_price = row.get('最低', 'N/A')
-                        volume = row.get('成交量', 'N/A')
-                        turnover = row.get('成交额', 'N/A')
-                        
-                        kline_content += f"{date}: 开盘={open_price}, 收盘={close_price}, "
-                        kline_content += f"最高={high_price}, 最低={low_price}, "
-                        kline_content += f"成交量={volume}, 成交额={turnover}\n"
-                    
-                    kline_content += f"\n（共 {len(kline_df)} 条K线数据，仅显示最近5天）\n"
+                    if tuple(recent_kline.columns) != _KLINE_FIELDS:
+                        recent_kline = recent_kline.reindex(columns=list(_KLINE_FIELDS), fill_value=_NA)
+                    kline_lines = "".join(
+                        f"{date}: 开盘={open_price}, 收盘={close_price}, "
+                        f"最高={high_price}, 最低={low_price}, "
+                        f"成交量={volume}, 成交额={turnover}\n"
+                        for date, open_price, close_price, high_price, low_price, volume, turnover
+                        in recent_kline.itertuples(index=False, name=None)
+                    )
+                    kline_content = (
+                        f"股票代码: {ticker_normalized}\n"
+                        f"查询时间: {trigger_time}\n"
+                        f"交易日期: {trade_date}\n\n"
+                        "最近30天日K线数据:\n\n"
+                        f"{kline_lines}"
+                        f"\n（共 {len(kline_df)} 条K线数据，仅显示最近5天）\n"
+                    )
                     
                     all_records.append({
                         "title": f"{ticker_normalized} K线数据",
@@ -420,11 +548,32 @@ class StockMarketDataAkshare(DataSourceBase):
         except Exception as e:
             logger.error(f"获取市场数据失败: {e}")
             return pd.DataFrame(columns=self.REQUIRED_COLUMNS)
+    
+    async def get_data_many(self, trigger_time: str, tickers: List[str]) -> Dict[str, pd.DataFrame]:
+        """
+        批量获取多只股票的市场数据
+        
+        各股票的 get_data 并发执行，同时进行的股票数不超过 BATCH_CONCURRENCY，避免对数据源造成过大压力。
+        
+        Args:
+            trigger_time: 触发时间字符串，格式 'YYYY-MM-DD HH:MM:SS'
+            tickers: 股票代码列表（格式同 get_data 的 ticker）
+            
+        Returns:
+            股票代码 -> DataFrame（与 get_data 的返回格式相同）
+        """
+        semaphore = asyncio.Semaphore(self.BATCH_CONCURRENCY)
+        
+        async def fetch_one(ticker: str) -> pd.DataFrame:
+            async with semaphore:
+                return await self.get_data(trigger_time, ticker=ticker)
+        
+        results = await asyncio.gather(*(fetch_one(ticker) for ticker in tickers))
+        return dict(zip(tickers, results))
 
 
 if __name__ == "__main__":
     # 测试代码
-    import asyncio
     stock_market = StockMarketDataAkshare(use_cache=False)
     trigger_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     df = asyncio.run(stock_market.fetch_data_async(trigger_time, ticker="000001"))
@@ -4,18 +4,64 @@
 从同花顺财经网站爬取新闻数据，返回统一格式
 """
 import asyncio
-import requests
+import aiohttp
+import codecs
+import html
 import json
 import re
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from dateutil.tz import tzlocal
+from typing import List, Dict, Any, Optional, Callable, Awaitable, Tuple, TypeVar
+from urllib.parse import urljoin
 import time
 import random
 from loguru import logger
 
 from .data_source_base import DataSourceBase
 
+T = TypeVar("T")
+
+# 可选依赖：有 selectolax 时用 C 实现的 HTML 解析器提取文本（同时解码实体），否则退回正则
+# selectolax 1.0 起只提供 lexbor 后端，旧版本使用 modest 后端
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+    HAS_SELECTOLAX = True
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser
+        HAS_SELECTOLAX = True
+    except ImportError:
+        HTMLParser = None
+        HAS_SELECTOLAX = False
+
+# 可选依赖：有 orjson 时直接解析响应字节，否则用标准库 json（同样接受 bytes）
+# orjson.JSONDecodeError 是 json.JSONDecodeError 的子类，两种情况共用同一个 except 分支
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_MD_LINK_TEXT_RE = re.compile(r"\[([^\]]+)\]\([^)]+\)")
+_WS_RE = re.compile(r"\s+")
+_URL_DATE_RE = re.compile(r"/(\d{8})/")
+_TIME_RE = re.compile(r"\b(\d{1,2}):(\d{2})\b")
+_CN_DATE_RE = re.compile(r"(\d{4})[年/\\-](\d{1,2})[月/\\-](\d{1,2})")
+_MD_LINK_RE = re.compile(r"\[([^\]]+)\]\((https?://[^)\s]+)[^)]*\)")
+_MD_BRACKET_RE = re.compile(r"\[([^\]]+)\]")
+# 列表页 HTML 的正则提取（未安装 selectolax 时使用）
+_LI_RE = re.compile(r"<li\b[^>]*>(.*?)</li>", re.I | re.S)
+_ANCHOR_RE = re.compile(r"<a\b([^>]*)>(.*?)</a>", re.I | re.S)
+_HREF_ATTR_RE = re.compile(r"""href\s*=\s*["']([^"']*)["']""", re.I)
+_TITLE_ATTR_RE = re.compile(r"""title\s*=\s*["']([^"']*)["']""", re.I)
+# 页面头部 <meta charset=...> / <meta http-equiv=... content="...; charset=..."> 中声明的编码
+_META_CHARSET_RE = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?([A-Za-z0-9_-]+)""", re.I)
+
+# 时间戳按本地时区解释（与 datetime.fromtimestamp 一致）
+_LOCAL_TZ = tzlocal()
+
 
 class ThxNewsCrawl(DataSourceBase):
     """
@@ -24,6 +70,43 @@ class ThxNewsCrawl(DataSourceBase):
     从同花顺财经网站获取新闻数据，返回统一格式的 DataFrame
     """
     
+    # 快讯列表接口及请求头（所有请求共用，由会话统一设置）
+    # 不设置 Accept-Encoding：由 aiohttp 按已安装的解码器（brotli、zstandard 为可选）自动声明并解压
+    API_URL = "https://news.10jqka.com.cn/tapp/news/push/stock/"
+    # 接口固定参数（每页请求只追加 page / pagesize）
+    API_PARAMS = {'tag': '', 'track': 'website'}
+    HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36',
+        'Accept': '*/*',
+        'Accept-Language': 'zh-CN,zh;q=0.9',
+        'Referer': 'https://news.10jqka.com.cn/realtimenews.html',
+        'Origin': 'https://news.10jqka.com.cn',
+        'Connection': 'keep-alive',
+        'Sec-Fetch-Dest': 'empty',
+        'Sec-Fetch-Mode': 'cors',
+        'Sec-Fetch-Site': 'same-origin',
+        'X-Requested-With': 'XMLHttpRequest'
+    }
+    # 前端列表页是普通网页请求，覆盖会话中面向接口的请求头
+    FRONTEND_HEADERS = {
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        'Referer': 'https://stock.10jqka.com.cn/',
+        'Sec-Fetch-Dest': 'document',
+        'Sec-Fetch-Mode': 'navigate',
+        'Sec-Fetch-Site': 'same-site',
+    }
+    
+    # 并发上限：API 请求及前端 HTTP 爬取 / crawl4ai 前端爬取（浏览器页面开销较大，并发更低）
+    MAX_CONCURRENCY = 16
+    FRONTEND_CONCURRENCY = 5
+    
+    # 请求重试：网络错误、超时及以下状态码按指数退避重试（有 Retry-After 时优先采用）
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+    MAX_RETRIES = 4
+    FRONTEND_MAX_RETRIES = 1
+    RETRY_BASE_DELAY = 1.0
+    RETRY_MAX_DELAY = 30.0
+    
     def __init__(self, max_pages: int = 5, enable_frontend_crawl: bool = False,
                  max_size_kb: Optional[float] = 512.0,
                  max_time_range_days: Optional[int] = 7,
@@ -32,7 +115,7 @@ class ThxNewsCrawl(DataSourceBase):
         """
         Args:
             max_pages: 最大爬取页数
-            enable_frontend_crawl: 是否启用前端爬取（需要 crawl4ai，默认关闭）
+            enable_frontend_crawl: 是否启用前端爬取（需要 selectolax 或 crawl4ai，默认关闭）
             max_size_kb: 最大数据大小（KB）
             max_time_range_days: 最大时间范围（天数）
             max_records: 最大记录数
@@ -43,33 +126,177 @@ class ThxNewsCrawl(DataSourceBase):
                         max_records=max_records, use_cache=use_cache)
         self.max_pages = max_pages
         self.enable_frontend_crawl = enable_frontend_crawl
+        # 复用的 HTTP 会话（连接池），首次使用时创建，绑定创建时的事件循环
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """
+        获取复用的 HTTP 会话
+        
+        同一事件循环内多次爬取共用一个连接池，避免每页重复 TCP/TLS 握手；
+        会话已关闭或事件循环已变化时重新创建。
+        
+        Returns:
+            aiohttp.ClientSession
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=64,
+                limit_per_host=64,
+                keepalive_timeout=120,
+                ttl_dns_cache=300,
+                enable_cleanup_closed=True
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=30),
+                headers=self.HEADERS,
+                auto_decompress=True
+            )
+            self._session_loop = loop
+        return self._session
+    
+    async def aclose(self):
+        """关闭复用的 HTTP 会话（需在创建会话的事件循环中调用）"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+
+    def _retry_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        计算第 attempt 次（从 0 开始）重试前的等待秒数
+        
+        Retry-After 为整数秒时直接采用，否则按 RETRY_BASE_DELAY * 2**attempt 指数退避并加随机抖动，
+        结果不超过 RETRY_MAX_DELAY。
+        """
+        if retry_after and retry_after.strip().isdigit():
+            return min(float(retry_after.strip()), self.RETRY_MAX_DELAY)
+        return min(self.RETRY_BASE_DELAY * 2 ** attempt + random.random(), self.RETRY_MAX_DELAY)
+    
+    async def _get_with_retry(self, session: aiohttp.ClientSession, url: str,
+                              read: Callable[[aiohttp.ClientResponse], Awaitable[T]],
+                              **kwargs) -> T:
+        """
+        带重试的 GET 请求
+        
+        网络错误、超时以及 RETRY_STATUSES 中的状态码会按 _retry_delay 等待后重试，最多 MAX_RETRIES 次；
+        重试用尽时，异常照常抛出，可重试状态码的响应照常交给 read 处理。
+        read 抛出的其他状态码错误（如 403、404）不重试，直接抛出。
+        
+        Args:
+            session: HTTP 会话
+            url: 请求地址
+            read: 读取响应的协程函数（在响应上下文内调用）
+            **kwargs: 透传给 session.get 的参数
+            
+        Returns:
+            read 的返回值
+        """
+        attempt = 0
+        while True:
+            try:
+                async with session.get(url, **kwargs) as resp:
+                    if resp.status not in self.RETRY_STATUSES or attempt >= self.MAX_RETRIES:
+                        return await read(resp)
+                    delay = self._retry_delay(attempt, resp.headers.get("Retry-After"))
+                    logger.debug(f"请求 {url} 返回 {resp.status}，{delay:.2f} 秒后重试")
+            except aiohttp.ClientResponseError as e:
+                # read 中 raise_for_status 抛出的状态码错误：只有 RETRY_STATUSES 中的才重试
+                if e.status not in self.RETRY_STATUSES or attempt >= self.MAX_RETRIES:
+                    raise
+                delay = self._retry_delay(attempt, (e.headers or {}).get("Retry-After"))
+                logger.debug(f"请求 {url} 返回 {e.status}，{delay:.2f} 秒后重试")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt >= self.MAX_RETRIES:
+                    raise
+                delay = self._retry_delay(attempt)
+                logger.debug(f"请求 {url} 失败（{type(e).__name__}），{delay:.2f} 秒后重试")
+            attempt += 1
+            await asyncio.sleep(delay)
+    
+    @staticmethod
+    async def _read_ok(resp: aiohttp.ClientResponse) -> bytes:
+        """检查状态码（非 2xx 时抛出 ClientResponseError）并读取响应体"""
+        resp.raise_for_status()
+        return await resp.read()
+    
+    @staticmethod
+    async def _read_text(resp: aiohttp.ClientResponse) -> str:
+        """
+        检查状态码并将列表页解码为文本
+        
+        编码依次取 Content-Type 中的 charset、页面 <meta> 声明的编码，都没有（或无法识别）时按 GBK 解码；
+        不使用 aiohttp 的默认回退（UTF-8），否则中文标题会被替换成乱码。
+        """
+        resp.raise_for_status()
+        raw = await resp.read()
+        encoding = resp.charset
+        if not encoding:
+            m_charset = _META_CHARSET_RE.search(raw[:4096])
+            encoding = m_charset.group(1).decode("ascii") if m_charset else None
+        try:
+            encoding = codecs.lookup(encoding).name if encoding else "gbk"
+        except LookupError:
+            encoding = "gbk"
+        # GB2312 声明的页面实际常含 GBK 字符，按超集解码
+        if encoding == "gb2312":
+            encoding = "gbk"
+        return raw.decode(encoding, errors="replace")
+    
+    async def _arun_with_retry(self, crawler, url: str, semaphore: asyncio.Semaphore):
+        """
+        前端爬取单个页面，失败（抛出异常或 success 为 False）时按 _retry_delay 重试
+        
+        Args:
+            crawler: crawl4ai.AsyncWebCrawler
+            url: 页面地址
+            semaphore: 限制同时打开的页面数
+            
+        Returns:
+            crawl4ai 的 CrawlResult（重试用尽时返回最后一次的结果，或抛出最后一次的异常）
+        """
+        for attempt in range(self.FRONTEND_MAX_RETRIES + 1):
+            try:
+                async with semaphore:
+                    result = await crawler.arun(url=url)
+                if getattr(result, "success", True) or attempt >= self.FRONTEND_MAX_RETRIES:
+                    return result
+                logger.debug(f"前端页面 {url} 爬取失败，准备重试")
+            except Exception as e:
+                if attempt >= self.FRONTEND_MAX_RETRIES:
+                    raise
+                logger.debug(f"前端页面 {url} 爬取失败（{type(e).__name__}），准备重试")
+            await asyncio.sleep(self._retry_delay(attempt))
 
     def clean_text(self, text: str) -> str:
         """清理文本内容"""
         if not text:
             return ""
-        text = re.sub(r"<[^>]+>", " ", text)
-        text = re.sub(r"\[([^\]]+)\]\([^)]+\)", r"\1", text)
-        text = re.sub(r"\s+", " ", text).strip()
+        text = _TAG_RE.sub(" ", text)
+        text = _MD_LINK_TEXT_RE.sub(r"\1", text)
+        text = _WS_RE.sub(" ", text).strip()
         return text
 
     def parse_pub_time_from_frontend(self, line: str, url: str) -> str:
         """从前端页面解析发布时间"""
         try:
             date_part = None
-            m_url_date = re.search(r"/(\d{8})/", url or "")
+            m_url_date = _URL_DATE_RE.search(url or "")
             if m_url_date:
                 ymd = m_url_date.group(1)
                 date_part = f"{ymd[0:4]}-{ymd[4:6]}-{ymd[6:8]}"
             time_part = None
-            m_time = re.search(r"\b(\d{1,2}):(\d{2})\b", line or "")
+            m_time = _TIME_RE.search(line or "")
             if m_time:
                 h = int(m_time.group(1))
                 m = int(m_time.group(2))
                 if 0 <= h <= 23 and 0 <= m <= 59:
                     time_part = f"{h:02d}:{m:02d}:00"
             if not date_part:
-                m_cn = re.search(r"(\d{4})[年/\\-](\d{1,2})[月/\\-](\d{1,2})", line or "")
+                m_cn = _CN_DATE_RE.search(line or "")
                 if m_cn:
                     y = int(m_cn.group(1))
                     mo = int(m_cn.group(2))
@@ -90,15 +317,15 @@ class ThxNewsCrawl(DataSourceBase):
             line = raw_line.strip()
             if not (line.startswith('* ') or line.startswith('- ')):
                 continue
-            m_link = re.search(r"\[([^\]]+)\]\((https?://[^)\s]+)[^)]*\)", line)
+            m_link = _MD_LINK_RE.search(line)
             if not m_link:
                 continue
             title = (m_link.group(1) or "").strip()
             url = (m_link.group(2) or "").strip()
-            if not re.search(r"/(\d{8})/", url):
+            if not _URL_DATE_RE.search(url):
                 continue
             tail = line[m_link.end():]
-            m_intro = re.search(r"\[([^\]]+)\]", tail)
+            m_intro = _MD_BRACKET_RE.search(tail)
             intro = (m_intro.group(1) or "").strip() if m_intro else ""
             content = self.clean_text(intro)
             pub_time = self.parse_pub_time_from_frontend(line, url)
@@ -110,14 +337,80 @@ class ThxNewsCrawl(DataSourceBase):
             })
         return records
 
+    def extract_company_news_from_html(self, html_text: str, base_url: str = "") -> List[Dict[str, Any]]:
+        """
+        从列表页 HTML 提取公司新闻
+        
+        与 extract_company_news_from_markdown 对应：每个 <li> 中第一个带日期路径的链接为标题，
+        之后同类链接的文字为摘要，发布时间从 url 及 <li> 的文字中解析。
+        有 selectolax 时用其解析，否则退回正则提取。
+        
+        Args:
+            html_text: 页面 HTML
+            base_url: 页面地址，用于补全相对链接
+            
+        Returns:
+            新闻记录列表
+        """
+        if not html_text:
+            return []
+        items = self._iter_list_items(html_text) if HAS_SELECTOLAX else self._iter_list_items_regex(html_text)
+        records = []
+        for li_text, anchors in items:
+            links = []
+            for href, text, title_attr in anchors:
+                url = urljoin(base_url, href.strip())
+                if url.startswith(("http://", "https://")) and _URL_DATE_RE.search(url):
+                    links.append((url, text, title_attr))
+            if not links:
+                continue
+            url, title_text, title_attr = links[0]
+            intro = next((text for _, text, _ in links[1:] if text), "")
+            records.append({
+                "title": (title_attr or title_text).strip(),
+                "content": self.clean_text(intro),
+                "pub_time": self.parse_pub_time_from_frontend(li_text, url),
+                "url": url,
+            })
+        return records
+    
+    @staticmethod
+    def _iter_list_items(html_text: str):
+        """用 selectolax 遍历 <li>，产出 (li 文本, [(href, 链接文字, title 属性)])"""
+        for li in HTMLParser(html_text).css("li"):
+            anchors = [
+                (a.attributes.get("href") or "", a.text(strip=True), a.attributes.get("title") or "")
+                for a in li.css("a[href]")
+            ]
+            yield li.text(separator=" "), anchors
+    
+    @staticmethod
+    def _iter_list_items_regex(html_text: str):
+        """_iter_list_items 的正则版本（未安装 selectolax 时使用）"""
+        for m_li in _LI_RE.finditer(html_text):
+            li_html = m_li.group(1)
+            anchors = []
+            for m_a in _ANCHOR_RE.finditer(li_html):
+                m_href = _HREF_ATTR_RE.search(m_a.group(1))
+                if not m_href:
+                    continue
+                m_title = _TITLE_ATTR_RE.search(m_a.group(1))
+                anchors.append((
+                    html.unescape(m_href.group(1)),
+                    html.unescape(_TAG_RE.sub("", m_a.group(2))).strip(),
+                    html.unescape(m_title.group(1)) if m_title else "",
+                ))
+            yield html.unescape(_TAG_RE.sub(" ", li_html)), anchors
+
     def clean_html_content(self, html_content: str) -> str:
         """清理HTML内容"""
         if not html_content:
             return ""
-        clean_text = re.sub(r'<[^>]+>', '', html_content)
-        clean_text = re.sub(r'\s+', ' ', clean_text).strip()
-        clean_text = clean_text.replace('&nbsp;', ' ').replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>')
-        return clean_text
+        if HAS_SELECTOLAX:
+            clean_text = HTMLParser(html_content).text(separator='')
+        else:
+            clean_text = html.unescape(_TAG_RE.sub('', html_content))
+        return _WS_RE.sub(' ', clean_text).strip()
 
     def parse_pub_time(self, timestamp: int) -> str:
         """解析时间戳为字符串"""
@@ -127,119 +420,246 @@ class ThxNewsCrawl(DataSourceBase):
         except:
             return ""
 
-    def get_news_data(self, page: int = 1, pagesize: int = 400) -> List[Dict[str, Any]]:
-        """获取新闻数据（API方式）"""
-        url = "https://news.10jqka.com.cn/tapp/news/push/stock/"
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36',
-            'Accept': '*/*',
-            'Accept-Language': 'zh-CN,zh;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br, zstd',
-            'Referer': 'https://news.10jqka.com.cn/realtimenews.html',
-            'Origin': 'https://news.10jqka.com.cn',
-            'Connection': 'keep-alive',
-            'Sec-Fetch-Dest': 'empty',
-            'Sec-Fetch-Mode': 'cors',
-            'Sec-Fetch-Site': 'same-origin',
-            'X-Requested-With': 'XMLHttpRequest'
-        }
+    async def get_news_data(self, session: aiohttp.ClientSession, page: int = 1,
+                            pagesize: int = 400,
+                            semaphore: Optional[asyncio.Semaphore] = None) -> List[Dict[str, Any]]:
+        """
+        获取新闻数据（API方式）
         
-        params = {
-            'page': page,
-            'tag': '',
-            'track': 'website',
-            'pagesize': pagesize
-        }
+        session 应来自 _get_session()，请求头由会话统一设置；暂时性失败按 _get_with_retry 重试。
+        
+        Args:
+            session: HTTP 会话
+            page: 页码
+            pagesize: 每页条数
+            semaphore: 限制并发请求数，None 表示不限制
+            
+        Returns:
+            新闻记录列表，请求或解析失败时返回空列表
+        """
+        _, records = await self._get_news_page(session, page=page, pagesize=pagesize, semaphore=semaphore)
+        return records
+
+    async def _get_news_page(self, session: aiohttp.ClientSession, page: int = 1,
+                             pagesize: int = 400,
+                             semaphore: Optional[asyncio.Semaphore] = None) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        获取一页新闻（get_news_data 的实现），同时返回接口原始条数
+        
+        原始条数用于判断是否已到达末页：整页记录都缺少 url 和 id 时记录列表为空，但不代表没有后续页。
+        
+        Returns:
+            (接口返回的原始条数, 新闻记录列表)，请求或解析失败时返回 (0, [])
+        """
+        params = dict(self.API_PARAMS, page=page, pagesize=pagesize)
         
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=30)
-            response.raise_for_status()
-            data = response.json()
+            if semaphore is None:
+                raw = await self._get_with_retry(session, self.API_URL, self._read_ok, params=params)
+            else:
+                async with semaphore:
+                    raw = await self._get_with_retry(session, self.API_URL, self._read_ok, params=params)
+            data = _json_loads(raw)
             news_list = data.get('data', {}).get('list', [])
-            processed_news = []
-            for news in news_list:
-                title = news.get('title', '')
-                content = self.clean_html_content(news.get('digest', '')) 
-                pub_time = self.parse_pub_time(int(news.get('ctime', 0))) 
-                news_url = news.get('url', '')
-                
-                if not news_url and news.get('id'):
-                    news_url = f"https://news.10jqka.com.cn/tapp/news/push/stock/{news.get('id')}/"
-                
-                processed_news.append({
-                    'title': title,
-                    'content': content,
-                    'pub_time': pub_time,
-                    'url': news_url
-                })
+            if not news_list:
+                return 0, []
+            
+            # 整页一次性构造 DataFrame，按列处理（对应 clean_html_content / parse_pub_time 的逐条逻辑）
+            df = pd.DataFrame(news_list, columns=['title', 'digest', 'ctime', 'url', 'id'], dtype=object)
             
-            return processed_news
+            # 缺少 url 但有 id 的，拼接推送页地址；两者都没有的记录在去重时会被丢弃，先行过滤，不再做清洗
+            urls = df['url'].fillna('')
+            ids = df['id']
+            has_id = ids.notna() & ~ids.isin(['', 0])
+            df['url'] = urls.mask(
+                urls.eq('') & has_id,
+                'https://news.10jqka.com.cn/tapp/news/push/stock/' + ids.astype(str) + '/'
+            )
+            df = df[urls.ne('') | has_id]
             
-        except requests.exceptions.RequestException as e:
+            ctimes = pd.to_numeric(df['ctime'], errors='coerce')
+            ctimes = ctimes.where(ctimes > 0)
+            pub_times = pd.to_datetime(ctimes, unit='s', utc=True, errors='coerce')
+            df = df.assign(
+                title=df['title'].fillna(''),
+                content=df['digest'].fillna('').map(self.clean_html_content),
+                pub_time=pub_times.dt.tz_convert(_LOCAL_TZ).dt.strftime('%Y-%m-%d %H:%M:%S').fillna(''),
+            )
+            
+            return len(news_list), df[self.REQUIRED_COLUMNS].to_dict('records')
+            
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             logger.error(f"请求失败: {e}")
-            return []
+            return 0, []
         except json.JSONDecodeError as e:
             logger.error(f"JSON解析失败: {e}")
-            return []
+            return 0, []
         except Exception as e:
             logger.error(f"未知错误: {e}")
-            return []
+            return 0, []
 
-    def crawl_multiple_pages(self) -> List[Dict[str, Any]]:
-        """爬取多页数据"""
-        all_news = []
+    async def crawl_multiple_pages(self) -> List[Dict[str, Any]]:
+        """
+        爬取多页数据
         
-        for page in range(1, self.max_pages + 1):
-            page_news = self.get_news_data(page=page, pagesize=400)
-            
-            if not page_news:
+        各页通过同一会话并发请求；结果按页码顺序合并，遇到第一个空页（接口未返回任何条目，或请求失败）即停止
+        （与逐页爬取的结果一致）。某页为空时，立即取消页码更大、尚未完成的请求。
+        """
+        session = await self._get_session()
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENCY)
+        tasks = {
+            page: asyncio.create_task(
+                self._get_news_page(session, page=page, pagesize=400, semaphore=semaphore)
+            )
+            for page in range(1, self.max_pages + 1)
+        }
+        page_of = {task: page for page, task in tasks.items()}
+        
+        try:
+            pending = set(tasks.values())
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                empty_pages = [page_of[task] for task in done if task.result()[0] == 0]
+                if empty_pages:
+                    first_empty = min(empty_pages)
+                    for task in pending:
+                        if page_of[task] > first_empty:
+                            task.cancel()
+                    pending = {task for task in pending if page_of[task] < first_empty}
+        finally:
+            # 调用方被取消时，不留下未完成的请求
+            for task in tasks.values():
+                task.cancel()
+        
+        all_news = []
+        for page in sorted(tasks):
+            task = tasks[page]
+            if task.cancelled():
+                break
+            row_count, page_news = task.result()
+            if row_count == 0:
                 break
-                
             all_news.extend(page_news)
-            # 优化：移除人为延迟以提升性能
-            # 如果需要限流，可以考虑使用异步sleep: await asyncio.sleep(0.1)
-            # if page < self.max_pages:
-            #     delay = random.uniform(1, 3)
-            #     time.sleep(delay)
         
         return all_news
 
+    @staticmethod
+    def _frontend_page_urls() -> List[str]:
+        """前端爬取的列表页：公司新闻与沪深盘评各 20 页"""
+        company_news_urls = [
+            "https://stock.10jqka.com.cn/companynews_list/index.shtml",
+            *[f"https://stock.10jqka.com.cn/companynews_list/index_{i}.shtml" for i in range(2, 21)],
+        ]
+        hsdp_urls = [
+            "https://stock.10jqka.com.cn/hsdp_list/index.shtml",
+            *[f"https://stock.10jqka.com.cn/hsdp_list/index_{i}.shtml" for i in range(2, 21)],
+        ]
+        return company_news_urls + hsdp_urls
+    
+    async def _fetch_frontend_page(self, session: aiohttp.ClientSession, url: str,
+                                   semaphore: asyncio.Semaphore) -> List[Dict[str, Any]]:
+        """
+        通过 HTTP 会话下载单个列表页并解析 HTML
+        
+        Args:
+            session: HTTP 会话（与 API 爬取共用）
+            url: 列表页地址
+            semaphore: 限制并发请求数
+            
+        Returns:
+            新闻记录列表，请求失败时返回空列表
+        """
+        try:
+            async with semaphore:
+                html_text = await self._get_with_retry(
+                    session, url, self._read_text, headers=self.FRONTEND_HEADERS
+                )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.debug(f"前端页面 {url} 请求失败: {e}")
+            return []
+        return self.extract_company_news_from_html(html_text, base_url=url)
+    
+    async def _crawl_frontend_http(self, page_urls: List[str]) -> List[Dict[str, Any]]:
+        """前端爬取（HTTP + selectolax）：复用 API 爬取的会话与连接池，不启动浏览器"""
+        session = await self._get_session()
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENCY)
+        pages = await asyncio.gather(*(
+            self._fetch_frontend_page(session, url, semaphore) for url in page_urls
+        ))
+        
+        all_records = [record for page_records in pages for record in page_records]
+        logger.info(f"前端爬取完成，获取 {len(all_records)} 条记录")
+        return all_records
+
+    def _extract_crawl_results(self, results: list) -> List[Dict[str, Any]]:
+        """
+        从 crawl4ai 的爬取结果中提取新闻记录
+        
+        优先直接解析页面 HTML，取不到记录时再解析 crawl4ai 生成的 Markdown。
+        
+        Args:
+            results: crawl4ai 的 CrawlResult 列表
+            
+        Returns:
+            新闻记录列表
+        """
+        all_records = []
+        for res in results:
+            page_html = getattr(res, "html", "") or getattr(res, "cleaned_html", "")
+            records = self.extract_company_news_from_html(page_html, base_url=getattr(res, "url", "") or "")
+            if not records:
+                page_markdown = getattr(res, "markdown", "")
+                records = self.extract_company_news_from_markdown(page_markdown)
+            all_records.extend(records)
+        return all_records
+
     async def crawl_frontend_pages(self) -> List[Dict[str, Any]]:
-        """前端爬取（需要 crawl4ai）"""
+        """
+        前端爬取
+        
+        安装了 selectolax 时直接下载列表页 HTML 解析（与 API 爬取共用会话）；
+        否则退回 crawl4ai 渲染页面后解析其 HTML（必要时解析 Markdown），两者都不可用时跳过。
+        """
         if not self.enable_frontend_crawl:
             logger.info("前端爬取已禁用")
             return []
         
+        page_urls = self._frontend_page_urls()
+        
+        if HAS_SELECTOLAX:
+            logger.info(f"开始前端爬取，共 {len(page_urls)} 页")
+            try:
+                return await self._crawl_frontend_http(page_urls)
+            except Exception as e:
+                logger.error(f"前端爬取失败: {e}")
+                return []
+        
         try:
             # 尝试导入 crawl4ai
             try:
                 from crawl4ai import AsyncWebCrawler
             except ImportError:
-                logger.warning("crawl4ai 未安装，跳过前端爬取")
+                logger.warning("selectolax 与 crawl4ai 均未安装，跳过前端爬取")
                 return []
             
             async with AsyncWebCrawler() as crawler:
-                company_news_urls = [
-                    "https://stock.10jqka.com.cn/companynews_list/index.shtml",
-                    *[f"https://stock.10jqka.com.cn/companynews_list/index_{i}.shtml" for i in range(2, 21)],
-                ]
-                
-                hsdp_urls = [
-                    "https://stock.10jqka.com.cn/hsdp_list/index.shtml",
-                    *[f"https://stock.10jqka.com.cn/hsdp_list/index_{i}.shtml" for i in range(2, 21)],
-                ]
-                
-                page_urls = company_news_urls + hsdp_urls
                 logger.info(f"开始前端爬取，共 {len(page_urls)} 页")
                 
-                results = await crawler.arun_many(urls=page_urls)
-                logger.info(f"前端爬取完成，处理 {len(results or [])} 个响应")
+                semaphore = asyncio.Semaphore(self.FRONTEND_CONCURRENCY)
+                results = await asyncio.gather(
+                    *(self._arun_with_retry(crawler, url, semaphore) for url in page_urls),
+                    return_exceptions=True
+                )
+                failed = [res for res in results if isinstance(res, BaseException)]
+                if failed:
+                    logger.warning(f"前端爬取有 {len(failed)} 页失败: {failed[0]}")
+                logger.info(f"前端爬取完成，处理 {len(results) - len(failed)} 个响应")
                 
-                all_records = []
-                for res in (results or []):
-                    page_markdown = getattr(res, "markdown", "")
-                    all_records.extend(self.extract_company_news_from_markdown(page_markdown))
+                # 解析为纯 CPU 计算，放到线程中执行，避免阻塞并发进行的 API 爬取
+                all_records = await asyncio.to_thread(
+                    self._extract_crawl_results,
+                    [res for res in results if not isinstance(res, BaseException)]
+                )
                 
                 logger.info(f"前端爬取完成，获取 {len(all_records)} 条记录")
                 return all_records
@@ -259,7 +679,7 @@ class ThxNewsCrawl(DataSourceBase):
             DataFrame with columns ['title', 'content', 'pub_time', 'url']
         """
         tasks = [
-            asyncio.to_thread(self.crawl_multiple_pages),  # API爬取
+            self.crawl_multiple_pages(),  # API爬取
             self.crawl_frontend_pages()  # 前端爬取
         ]
         
@@ -298,24 +718,21 @@ class ThxNewsCrawl(DataSourceBase):
             logger.warning("⚠️ 未收集到任何数据")
             return pd.DataFrame(columns=self.REQUIRED_COLUMNS)
         
-        # 去重
-        seen_urls = set()
-        deduped_news = []
+        # 按 url 去重（保留首次出现的记录，dict 保持插入顺序），再按列直接构造 DataFrame
+        by_url = {}
         for news in all_news_data:
-            url = news.get('url', '')
-            if url and url not in seen_urls:
-                seen_urls.add(url)
-                deduped_news.append(news)
-        
-        df = pd.DataFrame(deduped_news)
+            url = news.get('url')
+            if url:
+                by_url.setdefault(url, news)
+        deduped_news = by_url.values()
         
-        # 确保所有必需列都存在
-        for col in self.REQUIRED_COLUMNS:
-            if col not in df.columns:
-                df[col] = ""
-        
-        # 只返回必需列，时间筛选由 normalize_dataframe 统一处理
-        df = df[self.REQUIRED_COLUMNS].copy()
+        # 列顺序即 REQUIRED_COLUMNS，时间筛选由 normalize_dataframe 统一处理
+        df = pd.DataFrame({
+            'title': [news.get('title', '') for news in deduped_news],
+            'content': [news.get('content', '') for news in deduped_news],
+            'pub_time': [news.get('pub_time', '') for news in deduped_news],
+            'url': list(by_url),
+        }, columns=self.REQUIRED_COLUMNS)
         
         logger.info(f"成功获取同花顺新闻原始数据，共 {len(df)} 条记录（去重后，时间筛选由 normalize_dataframe 统一处理）")
         return df
@@ -324,7 +741,14 @@ class ThxNewsCrawl(DataSourceBase):
 if __name__ == "__main__":
     # 测试代码
     crawler = ThxNewsCrawl(max_pages=2, enable_frontend_crawl=False)
-    df = asyncio.run(crawler.fetch_data_async("2025-01-20 15:00:00"))
+    
+    async def _main():
+        try:
+            return await crawler.fetch_data_async("2025-01-20 15:00:00")
+        finally:
+            await crawler.aclose()
+    
+    df = asyncio.run(_main())
     print(f"获取到 {len(df)} 条记录")
     if not df.empty:
         print(df.head())
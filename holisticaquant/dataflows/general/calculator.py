@@ -2,11 +2,28 @@ from typing import List, Callable, Dict
 from pydantic import BaseModel
 from .generay_tool_base import GeneralToolBase
 from datetime import datetime
+from functools import lru_cache
 import ast
 import operator
 from holisticaquant.dataflows.utils.general_tool_utils import eval_expr
 
 
+# 允许的操作符
+_ALLOWED_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Pow: operator.pow
+}
+
+
+@lru_cache(maxsize=512)
+def _parse_expression(expression: str) -> ast.Expression:
+    """解析表达式为 AST（按表达式字符串缓存，eval_expr 不会修改语法树）"""
+    return ast.parse(expression, mode='eval')
+
+
 class CalculatorTool(GeneralToolBase):
     """计算工具
     
@@ -19,7 +36,7 @@ class CalculatorTool(GeneralToolBase):
         """安全地计算数学表达式
         
         使用 AST（抽象语法树）来安全地计算表达式，
-        避免执行任意代码的安全风险。
+        避免执行任意代码的安全风险。相同表达式的语法树会被缓存复用。
         
         Args:
             expression: 数学表达式字符串（如 "2 + 3 * 4"）
@@ -27,19 +44,10 @@ class CalculatorTool(GeneralToolBase):
         Returns:
             包含计算结果或错误的字典
         """
-        # 定义允许的操作符
-        allowed_ops = {
-            ast.Add: operator.add,
-            ast.Sub: operator.sub,
-            ast.Mult: operator.mul,
-            ast.Div: operator.truediv,
-            ast.Pow: operator.pow
-        }
-        
         # 安全地解析和计算表达式
         try:
-            tree = ast.parse(expression, mode='eval')
-            result = eval_expr(tree.body, allowed_ops)
+            tree = _parse_expression(expression)
+            result = eval_expr(tree.body, _ALLOWED_OPS)
             return {"result": result, "expression": expression}
         except Exception as e:
             return {"error": str(e), "expression": expression}
\ No newline at end of file
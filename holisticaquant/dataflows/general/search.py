@@ -1,3 +1,4 @@
+import asyncio
 from typing import List, Callable, Dict
 from pydantic import BaseModel
 from .generay_tool_base import GeneralToolBase
@@ -32,8 +33,8 @@ class SearchTool(GeneralToolBase):
         Returns:
             包含搜索结果的结构化数据
         """
-        # 调用搜索API（search_api是同步函数，但返回结果很快）
-        result = search_api(query)
+        # 调用搜索API（search_api 是同步的网络请求，放到线程中执行，避免阻塞事件循环）
+        result = await asyncio.to_thread(search_api, query)
         
         # 清理和格式化结果
         cleaned_result = clean_search_result(result)
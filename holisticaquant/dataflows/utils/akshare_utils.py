@@ -5,9 +5,14 @@ akshare 工具函数
 """
 import json
 import hashlib
+import mmap
 import pickle
+import threading
+import time
+import pandas as pd
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
+from loguru import logger
 from ...config.config import PROJECT_ROOT
 
 try:
@@ -20,10 +25,58 @@ except ImportError:
 
 DEFAULT_AKSHARE_CACHE_DIR = Path(PROJECT_ROOT) / "holisticaquant" / "dataflows" / "datasource" / "data_cache" / "akshare"
 
+# 缓存有效期（秒），按数据更新频率设置：未列出的函数使用 DEFAULT_CACHE_TTL
+# 缓存键不含日期，有效期是条目失效的唯一依据（日频数据另见 DAILY_CACHE_FUNCS）
+DEFAULT_CACHE_TTL = 3600
+CACHE_TTL_BY_FUNC = {
+    "stock_zh_index_daily": 86400,          # 指数日线历史，一天内只需获取一次
+    "stock_sse_summary": 86400,             # 上交所市场总貌，每个交易日更新一次
+    "stock_board_industry_name_em": 60,     # 板块实时行情快照，盘中变化快
+    "stock_board_concept_name_em": 60,      # 概念板块实时行情快照
+    "stock_zh_a_spot_em": 60,               # A 股实时行情快照
+}
+
+# 日频数据：条目最晚在下一个交易日边界（当日 15:00 收盘或次日 00:00）失效，
+# 避免盘中取到的未完结日线或前一天的数据被当作当前交易日使用
+DAILY_CACHE_FUNCS = frozenset({"stock_zh_index_daily", "stock_sse_summary"})
+MARKET_CLOSE_HOUR = 15
+
+
+def _cache_ttl(func_name: str, timestamp: float) -> float:
+    """
+    计算 timestamp 时写入的缓存条目的有效期（秒）
+    
+    日频函数的有效期不超过下一个交易日边界：收盘前写入的在当日 15:00 失效，收盘后写入的在次日 00:00 失效。
+    
+    Args:
+        func_name: akshare 函数名
+        timestamp: 写入时间（time.time() 时间戳）
+        
+    Returns:
+        有效期（秒）
+    """
+    ttl = CACHE_TTL_BY_FUNC.get(func_name, DEFAULT_CACHE_TTL)
+    if func_name not in DAILY_CACHE_FUNCS:
+        return ttl
+    written = datetime.fromtimestamp(timestamp)
+    close = written.replace(hour=MARKET_CLOSE_HOUR, minute=0, second=0, microsecond=0)
+    if written < close:
+        boundary = close
+    else:
+        boundary = written.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    return min(ttl, boundary.timestamp() - timestamp)
+
 
 class CachedAksharePro:
     """带缓存的 akshare 数据获取器"""
     
+    # 空结果记忆有效期（秒）：期间同一调用直接返回空结果，不再请求网络（仅在使用缓存时生效）
+    EMPTY_TTL = 60
+    # 空结果记忆的条目上限
+    EMPTY_CACHE_SIZE = 256
+    # 磁盘缓存前的进程内 LRU 条目上限（只缓存 DataFrame，过期时间与磁盘条目一致）
+    MEMORY_CACHE_SIZE = 256
+    
     def __init__(self, cache_dir=None, use_cache: bool = True):
         if not cache_dir:
             self.cache_dir = DEFAULT_AKSHARE_CACHE_DIR
@@ -32,6 +85,12 @@ class CachedAksharePro:
         if not self.cache_dir.exists():
             self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.use_cache = use_cache
+        # 空结果记忆：(func_name, 参数 JSON) -> (记录时间, 空结果)，dict 按写入顺序排列
+        self._empty_cache = {}
+        self._empty_lock = threading.Lock()
+        # 进程内 LRU：(func_name, 参数哈希) -> (过期时间, DataFrame)，dict 按访问顺序排列
+        self._memory_cache = {}
+        self._memory_lock = threading.Lock()
 
     def run(self, func_name: str, func_kwargs: dict, verbose: bool = False, use_cache: bool = None):
         """
@@ -53,11 +112,10 @@ class CachedAksharePro:
         should_use_cache = use_cache if use_cache is not None else self.use_cache
         
         if not should_use_cache:
-            # 如果禁用缓存，直接调用 akshare 函数，不缓存
+            # 如果禁用缓存，直接调用 akshare 函数，不缓存（也不使用空结果记忆）
             func_kwargs_dict = func_kwargs
             try:
-                result = getattr(ak, func_name)(**func_kwargs_dict)
-                return result
+                return getattr(ak, func_name)(**func_kwargs_dict)
             except AttributeError:
                 raise AttributeError(f"akshare函数 {func_name} 不存在，可能是akshare版本不兼容")
             except Exception as e:
@@ -69,8 +127,90 @@ class CachedAksharePro:
                     error_msg = f"{error_type}异常"
                 raise type(e)(f"akshare调用失败: {error_msg}") from e
         
+        # 近期返回过空结果的调用直接返回空结果
         func_kwargs_str = json.dumps(func_kwargs, sort_keys=True)
-        return self.run_with_cache(func_name, func_kwargs_str, verbose)
+        empty_key = (func_name, func_kwargs_str)
+        empty_hit = self._empty_get(empty_key)
+        if empty_hit is not None:
+            return empty_hit
+        
+        result = self.run_with_cache(func_name, func_kwargs_str, verbose)
+        self._remember_empty(empty_key, result)
+        return result
+    
+    def _empty_get(self, empty_key: tuple):
+        """
+        读取空结果记忆，EMPTY_TTL 内命中时返回空结果的副本，否则返回 None（顺带删除过期条目）
+        
+        Args:
+            empty_key: (func_name, 参数 JSON)
+        """
+        with self._empty_lock:
+            hit = self._empty_cache.get(empty_key)
+            if hit is None:
+                return None
+            if time.monotonic() - hit[0] >= self.EMPTY_TTL:
+                self._empty_cache.pop(empty_key, None)
+                return None
+        return hit[1].copy()
+    
+    def _remember_empty(self, empty_key: tuple, result) -> None:
+        """
+        结果为空 DataFrame 时记录下来，EMPTY_TTL 内的相同调用直接返回空结果
+        
+        写入时清理已过期的条目，仍超出 EMPTY_CACHE_SIZE 时淘汰最早写入的条目。
+        
+        Args:
+            empty_key: (func_name, 参数 JSON)
+            result: akshare 函数返回的结果
+        """
+        if not (isinstance(result, pd.DataFrame) and result.empty):
+            return
+        logger.debug(f"akshare {empty_key[0]}({empty_key[1]}) 返回空结果，{self.EMPTY_TTL}秒内不再请求")
+        now = time.monotonic()
+        with self._empty_lock:
+            self._empty_cache.pop(empty_key, None)
+            self._empty_cache[empty_key] = (now, result)
+            # 按写入顺序排列，过期条目都在最前面
+            while self._empty_cache:
+                oldest_key = next(iter(self._empty_cache))
+                expired = now - self._empty_cache[oldest_key][0] >= self.EMPTY_TTL
+                if not expired and len(self._empty_cache) <= self.EMPTY_CACHE_SIZE:
+                    break
+                self._empty_cache.pop(oldest_key)
+    
+    def _memory_get(self, key: tuple):
+        """
+        读取进程内 LRU，命中时返回 DataFrame 副本（调用方可以随意修改），未命中或已过期返回 None
+        
+        Args:
+            key: (func_name, 参数哈希)
+        """
+        with self._memory_lock:
+            hit = self._memory_cache.pop(key, None)
+            if hit is None or time.time() >= hit[0]:
+                return None
+            # 重新插入到末尾，标记为最近使用
+            self._memory_cache[key] = hit
+        return hit[1].copy()
+    
+    def _memory_put(self, key: tuple, expires_at: float, result) -> None:
+        """
+        写入进程内 LRU（仅 DataFrame），超出 MEMORY_CACHE_SIZE 时淘汰最久未使用的条目
+        
+        Args:
+            key: (func_name, 参数哈希)
+            expires_at: 过期时间（time.time() 时间戳）
+            result: akshare 函数返回的结果
+        """
+        if not isinstance(result, pd.DataFrame):
+            return
+        entry = (expires_at, result.copy())
+        with self._memory_lock:
+            self._memory_cache.pop(key, None)
+            self._memory_cache[key] = entry
+            while len(self._memory_cache) > self.MEMORY_CACHE_SIZE:
+                self._memory_cache.pop(next(iter(self._memory_cache)))
 
     def run_with_cache(self, func_name: str, func_kwargs: str, verbose: bool = False):
         """
@@ -88,44 +228,133 @@ class CachedAksharePro:
             raise ImportError("akshare 未安装，请运行: pip install akshare")
         
         func_kwargs_dict = json.loads(func_kwargs)
-        args_hash = hashlib.md5(str(func_kwargs_dict).encode()).hexdigest()
-        trigger_time = datetime.now().strftime("%Y%m%d%H")
-        args_hash = f"{args_hash}_{trigger_time}"
+        # 对 run() 生成的 sort_keys JSON 取哈希，与参数的插入顺序无关
+        args_hash = hashlib.blake2b(func_kwargs.encode(), digest_size=16).hexdigest()
+        
+        memory_key = (func_name, args_hash)
+        memory_hit = self._memory_get(memory_key)
+        if memory_hit is not None:
+            if verbose:
+                print(f"从内存缓存加载: {func_name}, 参数: {func_kwargs_dict}")
+            return memory_hit
         
         func_cache_dir = self.cache_dir / func_name
         if not func_cache_dir.exists():
             func_cache_dir.mkdir(parents=True, exist_ok=True)
         
+        # DataFrame 优先存为 feather，其余结果（或 feather 写入失败时）存为 pickle
+        func_feather_file = func_cache_dir / f"{args_hash}.feather"
         func_cache_file = func_cache_dir / f"{args_hash}.pkl"
+        # 旁路元数据文件，记录写入时间与有效期
+        func_meta_file = func_cache_dir / f"{args_hash}.json"
         
-        if func_cache_file.exists():
-            if verbose:
-                print(f"从缓存加载: {func_cache_file}")
-            with open(func_cache_file, "rb") as f:
-                return pickle.load(f)
-        else:
-            if verbose:
-                print(f"缓存未命中 {func_name}, 参数: {func_kwargs_dict}")
+        expires_at = self._expires_at(func_meta_file, func_name)
+        if expires_at is not None and time.time() < expires_at:
+            if func_feather_file.exists():
+                try:
+                    if verbose:
+                        print(f"从缓存加载: {func_feather_file}")
+                    result = pd.read_feather(func_feather_file)
+                    self._memory_put(memory_key, expires_at, result)
+                    return result
+                except Exception as e:
+                    # 未安装 pyarrow 或文件损坏时，视为缓存未命中
+                    logger.debug(f"读取 feather 缓存失败 {func_feather_file}: {e}")
+            elif func_cache_file.exists():
+                try:
+                    if verbose:
+                        print(f"从缓存加载: {func_cache_file}")
+                    # 映射文件后直接反序列化，不先把整个文件读入内存
+                    with open(func_cache_file, "rb") as f, \
+                            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        result = pickle.load(mm)
+                    self._memory_put(memory_key, expires_at, result)
+                    return result
+                except (OSError, ValueError, EOFError, pickle.UnpicklingError) as e:
+                    # 文件为空或损坏时，视为缓存未命中
+                    logger.debug(f"读取 pickle 缓存失败 {func_cache_file}: {e}")
+        elif func_meta_file.exists():
+            # 已过期：删除旧条目，下面重新获取
+            for stale_file in (func_feather_file, func_cache_file, func_meta_file):
+                stale_file.unlink(missing_ok=True)
+        
+        if verbose:
+            print(f"缓存未命中 {func_name}, 参数: {func_kwargs_dict}")
+        
+        try:
+            result = getattr(ak, func_name)(**func_kwargs_dict)
+        except AttributeError:
+            raise AttributeError(f"akshare函数 {func_name} 不存在，可能是akshare版本不兼容")
+        except Exception as e:
+            # 保留原始异常类型，但添加更详细的错误信息
+            error_type = type(e).__name__
+            error_msg = str(e) if str(e) else f"{error_type}异常（无详细信息）"
+            # 如果错误信息为空或None，使用异常类型
+            if not error_msg or error_msg == "None":
+                error_msg = f"{error_type}异常"
+            raise type(e)(f"akshare调用失败: {error_msg}") from e
+        
+        saved_file = self._save_result(result, func_feather_file, func_cache_file)
+        if verbose:
+            print(f"保存结果到: {saved_file}")
+        # 数据写完后再写元数据，元数据存在即表示缓存文件完整
+        timestamp = time.time()
+        ttl = _cache_ttl(func_name, timestamp)
+        with open(func_meta_file, "w", encoding="utf-8") as f:
+            json.dump({"timestamp": timestamp, "ttl": ttl}, f)
+        self._memory_put(memory_key, timestamp + ttl, result)
+        
+        return result
+    
+    @staticmethod
+    def _save_result(result, feather_file: Path, pickle_file: Path) -> Path:
+        """
+        写入缓存数据文件：DataFrame 存为 lz4 压缩的 feather，其余结果存为 pickle
+        
+        feather 写入失败（未安装 pyarrow、非默认索引、列名或列类型无法序列化等）时退回 pickle。
+        写入后删除另一种格式的旧文件，避免读取时命中过期数据。
+        
+        Args:
+            result: akshare 函数返回的结果
+            feather_file: feather 缓存文件路径
+            pickle_file: pickle 缓存文件路径
             
+        Returns:
+            实际写入的文件路径
+        """
+        if isinstance(result, pd.DataFrame):
             try:
-                result = getattr(ak, func_name)(**func_kwargs_dict)
-            except AttributeError:
-                raise AttributeError(f"akshare函数 {func_name} 不存在，可能是akshare版本不兼容")
+                result.to_feather(feather_file, compression="lz4")
+                pickle_file.unlink(missing_ok=True)
+                return feather_file
             except Exception as e:
-                # 保留原始异常类型，但添加更详细的错误信息
-                error_type = type(e).__name__
-                error_msg = str(e) if str(e) else f"{error_type}异常（无详细信息）"
-                # 如果错误信息为空或None，使用异常类型
-                if not error_msg or error_msg == "None":
-                    error_msg = f"{error_type}异常"
-                raise type(e)(f"akshare调用失败: {error_msg}") from e
-            
-            if verbose:
-                print(f"保存结果到: {func_cache_file}")
-            with open(func_cache_file, "wb") as f:
-                pickle.dump(result, f)
+                logger.debug(f"写入 feather 缓存失败 {feather_file}，改用 pickle: {e}")
+                feather_file.unlink(missing_ok=True)
+        
+        with open(pickle_file, "wb") as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        feather_file.unlink(missing_ok=True)
+        return pickle_file
+    
+    @staticmethod
+    def _expires_at(meta_file: Path, func_name: str):
+        """
+        根据元数据文件计算缓存的过期时间（日频函数同样截止到交易日边界，见 _cache_ttl）
+        
+        Args:
+            meta_file: 缓存元数据文件路径
+            func_name: akshare 函数名
             
-            return result
+        Returns:
+            过期时间（time.time() 时间戳），元数据不存在或无法解析时返回 None
+        """
+        try:
+            with open(meta_file, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            timestamp = float(meta["timestamp"])
+            return timestamp + min(float(meta["ttl"]), _cache_ttl(func_name, timestamp))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
 
 
 # 全局实例（默认启用缓存）
@@ -4,6 +4,7 @@
 提供交易日相关的日期计算功能
 """
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
 
 
@@ -41,30 +42,37 @@ def get_previous_trading_date(trigger_time: str, output_format: str = "%Y%m%d")
         上一个交易日，格式：YYYYMMDD
     """
     try:
-        # 解析 trigger_time
-        trigger_datetime = datetime.strptime(trigger_time, '%Y-%m-%d %H:%M:%S')
-        trigger_date = trigger_datetime.date()
-        
-        # 计算上一个交易日（简化版：跳过周末）
-        previous_date = trigger_date - timedelta(days=1)
-        
-        # 如果前一天是周六，往前推2天（到周五）
-        if previous_date.weekday() == 5:  # 周六
-            previous_date = previous_date - timedelta(days=1)
-        # 如果前一天是周日，往前推2天（到周五）
-        elif previous_date.weekday() == 6:  # 周日
-            previous_date = previous_date - timedelta(days=2)
-        
-        # 格式化输出
-        return previous_date.strftime(output_format)
-        
+        return _previous_trading_date_cached(trigger_time, output_format)
     except Exception as e:
-        # 如果解析失败，返回当前日期前一天
+        # 如果解析失败，返回当前日期前一天（依赖当前时间，不能缓存）
         today = datetime.now()
         previous_date = today - timedelta(days=1)
         return previous_date.strftime(output_format)
 
 
+@lru_cache(maxsize=128)
+def _previous_trading_date_cached(trigger_time: str, output_format: str) -> str:
+    """
+    get_previous_trading_date 的可缓存部分：结果只取决于参数，解析失败时抛出异常（异常不会被缓存）
+    """
+    # 解析 trigger_time
+    trigger_datetime = datetime.strptime(trigger_time, '%Y-%m-%d %H:%M:%S')
+    trigger_date = trigger_datetime.date()
+    
+    # 计算上一个交易日（简化版：跳过周末）
+    previous_date = trigger_date - timedelta(days=1)
+    
+    # 如果前一天是周六，往前推2天（到周五）
+    if previous_date.weekday() == 5:  # 周六
+        previous_date = previous_date - timedelta(days=1)
+    # 如果前一天是周日，往前推2天（到周五）
+    elif previous_date.weekday() == 6:  # 周日
+        previous_date = previous_date - timedelta(days=2)
+    
+    # 格式化输出
+    return previous_date.strftime(output_format)
+
+
 def is_trading_day(date_str: Optional[str] = None) -> bool:
     """
     判断是否为交易日